@@ -33,24 +33,23 @@ class BottomGroupPlacer:
             y_level: Y-coordinate for placement
             levels, positions, node_positions: Dicts to update
         """
+        get_group_elements = self.positioner.get_group_elements
+        get_group_nodes = self.positioner.get_group_nodes
+        get_group_width = self.positioner.get_group_width
+        spacing = self.WITHIN_GROUP_SPACING
         for target in targets:
-            target_group = self.group_name_to_group[target]
-            target_elements = target_group.get('elements', [target])
+            target_elements = get_group_elements(target)
             
             # Place target centered at x=6.0
-            if len(target_elements) > 1:
-                target_width = (len(target_elements) - 1) * self.WITHIN_GROUP_SPACING
-                target_start = 6.0 - target_width / 2.0
-            else:
-                target_start = 6.0
+            target_start = 6.0 - get_group_width(target) / 2.0
             
             levels[target] = y_level
             positions[target] = (target_start, target_elements)
             
-            for i, elem in enumerate(target_elements):
-                # Skip special symbols like '+' - they're visual separators, not nodes
-                if elem not in ['+', '-', '|']:
-                    node_positions[elem] = target_start + i * self.WITHIN_GROUP_SPACING
+            # Separator symbols like '+' are skipped - they're not nodes
+            node_positions.update(
+                [(elem, target_start + i * spacing) for i, elem in get_group_nodes(target)]
+            )
     
     def place_source_groups_above_targets(self, source_to_target: Dict, y_level: int,
                                            levels: Dict, positions: Dict, node_positions: Dict) -> None:
@@ -62,34 +61,27 @@ class BottomGroupPlacer:
             y_level: Y-coordinate for placement (sources go at y_level + 1)
             levels, positions, node_positions: Dicts to update
         """
+        positioner = self.positioner
+        spacing = self.WITHIN_GROUP_SPACING
         for source, target in source_to_target.items():
             if target in positions:
                 target_start, target_elements = positions[target]
                 
                 # Calculate center of target
-                if len(target_elements) > 1:
-                    target_width = (len(target_elements) - 1) * self.WITHIN_GROUP_SPACING
-                    target_center = target_start + target_width / 2.0
-                else:
-                    target_center = target_start
+                target_center = target_start + positioner.calculate_group_width(target_elements) / 2.0
                 
                 # Place source centered above target
-                source_group = self.group_name_to_group[source]
-                source_elements = source_group.get('elements', [source])
+                source_elements = positioner.get_group_elements(source)
                 
-                if len(source_elements) > 1:
-                    source_width = (len(source_elements) - 1) * self.WITHIN_GROUP_SPACING
-                    source_start = target_center - source_width / 2.0
-                else:
-                    source_start = target_center
+                source_start = target_center - positioner.get_group_width(source) / 2.0
                 
                 levels[source] = y_level + 1
                 positions[source] = (source_start, source_elements)
                 
-                for i, elem in enumerate(source_elements):
-                    # Skip special symbols like '+' - they're visual separators, not nodes
-                    if elem not in ['+', '-', '|']:
-                        node_positions[elem] = source_start + i * self.WITHIN_GROUP_SPACING
+                # Separator symbols like '+' are skipped - they're not nodes
+                node_positions.update(
+                    [(elem, source_start + i * spacing) for i, elem in positioner.get_group_nodes(source)]
+                )
     
     def place_dependent_bottom_groups(self, source_to_target, group_names, y_level,
                                        levels, positions, node_positions,
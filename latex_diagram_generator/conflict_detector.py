@@ -3,12 +3,22 @@
 Conflict detection for diagram layouts.
 """
 
+import math
+from bisect import bisect_left, bisect_right
+from itertools import groupby
 from typing import Dict, List, Tuple
 from .geometric_helper import GeometricHelper
 
 # Import spacing constants
 from .spacing_constants import TEXT_WIDTH, TEXT_HEIGHT, WITHIN_GROUP_SPACING
 
+# Labels closer than this vertically are on the same level; closer than this
+# in both directions they are at the same position
+POSITION_TOLERANCE = 0.1
+
+# Horizontal distance below which two labels on the same level overlap
+OVERLAP_WIDTH = max(TEXT_WIDTH, POSITION_TOLERANCE)
+
 
 class ConflictDetector:
     """Detects various types of conflicts in diagram layouts."""
@@ -44,13 +54,19 @@ class ConflictDetector:
             List of (source, sx, sy, target, tx, ty) tuples
         """
         arrows = []
+        get_position = positions.get
         for source, targets in links.items():
+            # An unplaced source has no arrows, whatever its targets
+            source_pos = get_position(source)
+            if source_pos is None:
+                continue
+            sx, sy = source_pos
             if not isinstance(targets, list):
                 targets = [targets]
             for target in targets:
-                if source in positions and target in positions:
-                    sx, sy = positions[source]
-                    tx, ty = positions[target]
+                target_pos = get_position(target)
+                if target_pos is not None:
+                    tx, ty = target_pos
                     arrows.append((source, sx, sy, target, tx, ty))
         return arrows
     
@@ -65,19 +81,39 @@ class ConflictDetector:
         Returns:
             List of (name1, x1, y1, name2, x2, y2) tuples
         """
-        text_overlaps = []
+        # Two labels overlap when they sit on the same level and closer than
+        # OVERLAP_WIDTH. Bucketing nodes into cells of that size means only
+        # the 3x3 cells around a node can hold overlapping labels.
+        cell_w = OVERLAP_WIDTH
+        cell_h = POSITION_TOLERANCE
         node_list = list(positions.items())
+        cells = {}
+        for index, (_, (x, y)) in enumerate(node_list):
+            cells.setdefault((math.floor(x / cell_w), math.floor(y / cell_h)), []).append(index)
         
-        for i, (name1, (x1, y1)) in enumerate(node_list):
-            for name2, (x2, y2) in node_list[i+1:]:
-                # Same position = overlap
-                if abs(x1 - x2) < 0.1 and abs(y1 - y2) < 0.1:
-                    text_overlaps.append((name1, x1, y1, name2, x2, y2))
-                # Horizontal overlap on same level
-                elif abs(y1 - y2) < 0.1:
-                    text_width = TEXT_WIDTH  # from spacing_constants
-                    if abs(x1 - x2) < text_width:
-                        text_overlaps.append((name1, x1, y1, name2, x2, y2))
+        pairs = []
+        for (cx, cy), members in cells.items():
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    neighbours = cells.get((cx + dx, cy + dy))
+                    if neighbours is None:
+                        continue
+                    for i in members:
+                        x1, y1 = node_list[i][1]
+                        for j in neighbours:
+                            if j <= i:
+                                continue
+                            x2, y2 = node_list[j][1]
+                            if abs(y1 - y2) < cell_h and abs(x1 - x2) < cell_w:
+                                pairs.append((i, j))
+        
+        # Report pairs in the same order as a pairwise scan over positions
+        pairs.sort()
+        text_overlaps = []
+        for i, j in pairs:
+            name1, (x1, y1) = node_list[i]
+            name2, (x2, y2) = node_list[j]
+            text_overlaps.append((name1, x1, y1, name2, x2, y2))
         
         return text_overlaps
     
@@ -92,26 +128,90 @@ class ConflictDetector:
         Returns:
             List of (s1, t1, s2, t2, ix, iy) tuples
         """
-        arrow_crossings = []
+        # Segments can only intersect when their bounding boxes overlap, so
+        # sweep the boxes by left edge and test just the overlapping pairs.
+        # The small tolerance keeps rounding in the orientation test from
+        # ever reporting a pair the sweep skipped.
+        eps = 1e-9
+        boxes = [
+            (min(sx, tx), max(sx, tx), min(sy, ty), max(sy, ty))
+            for _, sx, sy, _, tx, ty in arrows
+        ]
+        active = []
+        pairs = []
+        for k in sorted(range(len(arrows)), key=lambda k: boxes[k][0]):
+            min_x, _, min_y, max_y = boxes[k]
+            active = [a for a in active if boxes[a][1] >= min_x - eps]
+            for a in active:
+                if boxes[a][3] >= min_y - eps and boxes[a][2] <= max_y + eps:
+                    pairs.append((a, k) if a < k else (k, a))
+            active.append(k)
         
-        for i, (s1, sx1, sy1, t1, tx1, ty1) in enumerate(arrows):
-            for s2, sx2, sy2, t2, tx2, ty2 in arrows[i+1:]:
-                # Skip if arrows share endpoints
-                if s1 == s2 or s1 == t2 or t1 == s2 or t1 == t2:
-                    continue
-                
-                # Check if segments intersect
-                if GeometricHelper.segments_intersect(sx1, sy1, tx1, ty1, sx2, sy2, tx2, ty2):
-                    # Calculate intersection point
-                    denom = (sx1 - tx1) * (sy2 - ty2) - (sy1 - ty1) * (sx2 - tx2)
-                    if abs(denom) > 0.0001:
-                        t = ((sx1 - sx2) * (sy2 - ty2) - (sy1 - sy2) * (sx2 - tx2)) / denom
-                        ix = sx1 + t * (tx1 - sx1)
-                        iy = sy1 + t * (ty1 - sy1)
-                        arrow_crossings.append((s1, t1, s2, t2, ix, iy))
+        # Report crossings in the same order as a pairwise scan over arrows
+        pairs.sort()
+        arrow_crossings = []
+        for i, j in pairs:
+            s1, sx1, sy1, t1, tx1, ty1 = arrows[i]
+            s2, sx2, sy2, t2, tx2, ty2 = arrows[j]
+            # Skip if arrows share endpoints
+            if s1 == s2 or s1 == t2 or t1 == s2 or t1 == t2:
+                continue
+            
+            # Check if segments intersect
+            if GeometricHelper.segments_intersect(sx1, sy1, tx1, ty1, sx2, sy2, tx2, ty2):
+                # Calculate intersection point
+                denom = (sx1 - tx1) * (sy2 - ty2) - (sy1 - ty1) * (sx2 - tx2)
+                if abs(denom) > 0.0001:
+                    t = ((sx1 - sx2) * (sy2 - ty2) - (sy1 - sy2) * (sx2 - tx2)) / denom
+                    ix = sx1 + t * (tx1 - sx1)
+                    iy = sy1 + t * (ty1 - sy1)
+                    arrow_crossings.append((s1, t1, s2, t2, ix, iy))
         
         return arrow_crossings
     
+    @staticmethod
+    def count_row_crossings(arrows: List) -> int:
+        """
+        Count crossings between arrows that all run between the same two rows.
+        
+        Two such arrows cross exactly when their order at the source row and at
+        the target row disagree, so the count is the number of inversions of the
+        target x-positions taken in source order. Inversions are counted with a
+        Fenwick tree over the ranked target positions. Arrows that share a source
+        or target x-position touch at that point and are not counted.
+        
+        Args:
+            arrows: List of (source, sx, sy, target, tx, ty) tuples with common sy and ty
+            
+        Returns:
+            Number of crossing arrow pairs
+        """
+        ranks = {x: i + 1 for i, x in enumerate(sorted({arrow[4] for arrow in arrows}))}
+        size = len(ranks)
+        tree = [0] * (size + 1)
+        seen = 0
+        crossings = 0
+        
+        for _, batch in groupby(sorted(arrows, key=lambda a: a[1]), key=lambda a: a[1]):
+            batch_ranks = [ranks[arrow[4]] for arrow in batch]
+            
+            # Count earlier arrows (strictly left source) whose target is strictly right
+            for rank in batch_ranks:
+                not_right = 0
+                while rank > 0:
+                    not_right += tree[rank]
+                    rank -= rank & -rank
+                crossings += seen - not_right
+            
+            # Only record the batch afterwards so equal sources never count
+            for rank in batch_ranks:
+                while rank <= size:
+                    tree[rank] += 1
+                    rank += rank & -rank
+            seen += len(batch_ranks)
+        
+        return crossings
+    
     @staticmethod
     def check_arrow_through_text(arrows: List, positions: Dict) -> List:
         """
@@ -128,8 +228,28 @@ class ConflictDetector:
         text_width = TEXT_WIDTH
         text_height = TEXT_HEIGHT
         
+        eps = 1e-9  # see check_arrow_crossings
+        
+        # Nodes sorted by x, so each arrow only visits the nodes whose boxes
+        # can reach its x-range (with slack; the exact rejection test follows)
+        node_list = list(positions.items())
+        by_x = sorted(range(len(node_list)), key=lambda i: node_list[i][1][0])
+        xs = [node_list[i][1][0] for i in by_x]
+        reach_x = text_width / 2 + 1e-6
+        reach_y = text_height / 2 + 1e-6
+        
         for source, sx, sy, target, tx, ty in arrows:
-            for name, (nx, ny) in positions.items():
+            min_x, max_x = (sx, tx) if sx <= tx else (tx, sx)
+            min_y, max_y = (sy, ty) if sy <= ty else (ty, sy)
+            lo = bisect_left(xs, min_x - reach_x)
+            hi = bisect_right(xs, max_x + reach_x)
+            candidates = sorted(
+                i for i in by_x[lo:hi]
+                if min_y - reach_y <= node_list[i][1][1] <= max_y + reach_y
+            )
+            # Candidates are visited in positions order, as a full scan would
+            for i in candidates:
+                name, (nx, ny) = node_list[i]
                 # Skip source and target nodes
                 if name == source or name == target:
                     continue
@@ -140,6 +260,11 @@ class ConflictDetector:
                 box_min_y = ny - text_height / 2
                 box_max_y = ny + text_height / 2
                 
+                # A box clear of the arrow's bounding box cannot be crossed
+                if (box_max_x < min_x - eps or box_min_x > max_x + eps or
+                        box_max_y < min_y - eps or box_min_y > max_y + eps):
+                    continue
+                
                 if GeometricHelper.line_intersects_box(sx, sy, tx, ty, box_min_x, box_min_y, box_max_x, box_max_y):
                     arrow_through_text.append((source, target, name, nx, ny))
         
@@ -60,6 +60,10 @@ class ConflictResolver:
             If return_conflicts=True, returns (text_overlaps, arrow_crossings, arrow_through_text)
             Otherwise returns None
         """
+        # A single node can neither overlap nor sit in another arrow's path
+        if len(node_positions) < 2:
+            return ([], [], []) if return_conflicts else None
+        
         # Detect all conflicts using the detector
         text_overlaps, arrow_crossings, arrow_through_text = self.detector.detect_all_conflicts(
             node_positions, links, element_to_group, group_name_to_group, group_center_nodes,
@@ -151,10 +155,12 @@ class ConflictResolver:
         new_start = start_x + shift_amount
         positions[group_name] = (new_start, elements)
         
+        spacing = self.WITHIN_GROUP_SPACING
+        get_node = node_positions.get
         for i, elem in enumerate(elements):
-            if elem in node_positions:
-                old_node_id, old_x, old_y = node_positions[elem]
-                node_positions[elem] = (old_node_id, new_start + i * self.WITHIN_GROUP_SPACING, old_y)
+            node = get_node(elem)
+            if node is not None:
+                node_positions[elem] = (node[0], new_start + i * spacing, node[2])
     
     def _shift_group_vertically(self, group_name: str, shift_amount: float, levels: Dict,
                                 positions: Dict, node_positions: Dict) -> None:
@@ -176,13 +182,49 @@ class ConflictResolver:
         levels[group_name] = new_y
         
         start_x, elements = positions[group_name]
-        for i, elem in enumerate(elements):
-            if elem in node_positions:
-                old_node_id, old_x, _ = node_positions[elem]
-                node_positions[elem] = (old_node_id, old_x, new_y)
+        get_node = node_positions.get
+        for elem in elements:
+            node = get_node(elem)
+            if node is not None:
+                node_positions[elem] = (node[0], node[1], new_y)
     
-    def _find_group_for_element(self, element, group_name_to_group):
-        """Find which group an element belongs to."""
+    @staticmethod
+    def _build_elem_index(group_name_to_group: Dict) -> Dict:
+        """
+        Map every element to the group that _find_group_for_element would return.
+        
+        Groups are visited in order and the first group claiming an element
+        keeps it, matching the linear scan.
+        
+        Args:
+            group_name_to_group: Dict mapping group names to specs
+            
+        Returns:
+            Dict mapping element names to group names
+        """
+        index = {}
+        for group_name, group in group_name_to_group.items():
+            if 'elements' in group:
+                for element in group['elements']:
+                    index.setdefault(element, group_name)
+            else:
+                index.setdefault(group_name, group_name)
+        return index
+    
+    def _find_group_for_element(self, element, group_name_to_group, elem_index=None):
+        """
+        Find which group an element belongs to.
+        
+        Args:
+            element: Element name
+            group_name_to_group: Dict mapping group names to specs
+            elem_index: Optional index from _build_elem_index for the same groups
+            
+        Returns:
+            Group name, or None if no group contains the element
+        """
+        if elem_index is not None:
+            return elem_index.get(element)
         for group_name, group in group_name_to_group.items():
             if 'elements' in group:
                 if element in group['elements']:
@@ -192,7 +234,8 @@ class ConflictResolver:
         return None
     
     def _resolve_text_overlaps(self, text_overlaps: List, positions: Dict, 
-                               node_positions: Dict, group_name_to_group: Dict) -> bool:
+                               node_positions: Dict, group_name_to_group: Dict,
+                               elem_index: Dict = None) -> bool:
         """
         Resolve text overlap conflicts by shifting groups.
         
@@ -201,12 +244,15 @@ class ConflictResolver:
             positions: Dict of group positions to update
             node_positions: Dict of node positions to update
             group_name_to_group: Dict mapping group names to specs
+            elem_index: Optional index from _build_elem_index; built here if omitted
             
         Returns:
             True if any conflict was resolved
         """
+        if elem_index is None:
+            elem_index = self._build_elem_index(group_name_to_group)
         for name1, x1, y1, name2, x2, y2 in text_overlaps:
-            group1 = self._find_group_for_element(name1, group_name_to_group)
+            group1 = self._find_group_for_element(name1, group_name_to_group, elem_index)
             
             if group1 and group1 in positions:
                 self._shift_group_horizontally(group1, 1.0, positions, node_positions)
@@ -216,7 +262,8 @@ class ConflictResolver:
         return False
     
     def _resolve_arrow_crossings(self, arrow_crossings: List, positions: Dict,
-                                 node_positions: Dict, group_name_to_group: Dict) -> bool:
+                                 node_positions: Dict, group_name_to_group: Dict,
+                                 elem_index: Dict = None) -> bool:
         """
         Resolve arrow crossing conflicts by increasing horizontal separation between groups.
         
@@ -228,6 +275,7 @@ class ConflictResolver:
             positions: Dict of group positions to update
             node_positions: Dict of node positions to update
             group_name_to_group: Dict mapping group names to specs
+            elem_index: Optional index from _build_elem_index
             
         Returns:
             True if any conflict was resolved
@@ -239,8 +287,8 @@ class ConflictResolver:
         s1, t1, s2, t2, ix, iy = arrow_crossings[0]
         
         # Find groups for both arrow sources
-        group_s1 = self._find_group_for_element(s1, group_name_to_group)
-        group_s2 = self._find_group_for_element(s2, group_name_to_group)
+        group_s1 = self._find_group_for_element(s1, group_name_to_group, elem_index)
+        group_s2 = self._find_group_for_element(s2, group_name_to_group, elem_index)
         
         # If both sources are in different groups, push them apart
         if (group_s1 and group_s2 and group_s1 != group_s2 and 
@@ -275,7 +323,7 @@ class ConflictResolver:
     
     def _resolve_arrow_through_text(self, arrow_through_text: List, positions: Dict,
                                     node_positions: Dict, incoming: Dict,
-                                    group_name_to_group: Dict) -> bool:
+                                    group_name_to_group: Dict, elem_index: Dict = None) -> bool:
         """
         Resolve arrow-through-text conflicts by shifting groups or staggering elements.
         
@@ -285,15 +333,18 @@ class ConflictResolver:
             node_positions: Dict of node positions to update
             incoming: Dict of incoming links
             group_name_to_group: Dict mapping group names to specs
+            elem_index: Optional index from _build_elem_index; built here if omitted
             
         Returns:
             True if any conflict was resolved
         """
+        if elem_index is None:
+            elem_index = self._build_elem_index(group_name_to_group)
         for source, target, name, nx, ny in arrow_through_text:
             # Find which group the obstructing text belongs to
-            obstructing_group = self._find_group_for_element(name, group_name_to_group)
+            obstructing_group = self._find_group_for_element(name, group_name_to_group, elem_index)
             # Find which group the arrow source belongs to
-            source_group = self._find_group_for_element(source, group_name_to_group)
+            source_group = self._find_group_for_element(source, group_name_to_group, elem_index)
             
             # If source and obstructing text are in the same group (siblings)
             # apply vertical staggering to individual elements
@@ -340,7 +391,8 @@ class ConflictResolver:
         return False
     
     def _attempt_conflict_resolution(self, text_overlaps, arrow_crossings, arrow_through_text,
-                                     positions, node_positions, incoming, group_name_to_group):
+                                     positions, node_positions, incoming, group_name_to_group,
+                                     elem_index=None):
         """
         Attempt to resolve conflicts by trying different resolution strategies.
         
@@ -352,6 +404,7 @@ class ConflictResolver:
             node_positions: Dict of node positions to update
             incoming: Dict of incoming links
             group_name_to_group: Dict mapping group names to specs
+            elem_index: Optional index from _build_elem_index
             
         Returns:
             True if any conflict was resolved
@@ -359,7 +412,8 @@ class ConflictResolver:
         # Only try to resolve text overlaps - these are always fixable
         # Skip arrow crossings - horizontal shifting often makes them worse
         # Skip arrow-through-text - these are acceptable geometric artifacts
-        return self._resolve_text_overlaps(text_overlaps, positions, node_positions, group_name_to_group)
+        return self._resolve_text_overlaps(text_overlaps, positions, node_positions, group_name_to_group,
+                                           elem_index)
     
     def resolve_conflicts_iteratively(self, node_positions, levels, positions, 
                                      outgoing, incoming, group_name_to_group,
@@ -384,6 +438,9 @@ class ConflictResolver:
         """
         print("\n=== Starting Conflict Resolution ===\n")
         
+        # Group membership never changes while resolving, only positions do
+        elem_index = self._build_elem_index(group_name_to_group)
+        
         for iteration in range(max_iterations):
             # Detect current conflicts (using enhanced detection with .south anchors)
             text_overlaps, arrow_crossings, arrow_through_text = self.check_arrow_intersections(
@@ -404,7 +461,7 @@ class ConflictResolver:
             # Try to resolve conflicts in order of priority
             resolved_any = self._attempt_conflict_resolution(
                 text_overlaps, arrow_crossings, arrow_through_text,
-                positions, node_positions, incoming, group_name_to_group
+                positions, node_positions, incoming, group_name_to_group, elem_index
             )
             
             if not resolved_any:
@@ -488,11 +545,12 @@ class ConflictResolver:
         """
         # Count conflicts per group
         conflict_counts = {}
+        elem_index = self._build_elem_index(group_name_to_group)
         
         # Count arrow crossings
         for s1, t1, s2, t2, ix, iy in arrow_crossings:
-            g1 = self._find_group_for_element(s1, group_name_to_group)
-            g2 = self._find_group_for_element(s2, group_name_to_group)
+            g1 = self._find_group_for_element(s1, group_name_to_group, elem_index)
+            g2 = self._find_group_for_element(s2, group_name_to_group, elem_index)
             if g1:
                 conflict_counts[g1] = conflict_counts.get(g1, 0) + 1
             if g2:
@@ -500,8 +558,8 @@ class ConflictResolver:
         
         # Count arrow through text
         for source, target, name, nx, ny in arrow_through_text:
-            g_source = self._find_group_for_element(source, group_name_to_group)
-            g_name = self._find_group_for_element(name, group_name_to_group)
+            g_source = self._find_group_for_element(source, group_name_to_group, elem_index)
+            g_name = self._find_group_for_element(name, group_name_to_group, elem_index)
             if g_source:
                 conflict_counts[g_source] = conflict_counts.get(g_source, 0) + 1
             if g_name:
@@ -554,17 +612,18 @@ class ConflictResolver:
         """
         # Find groups involved in conflicts
         conflicted_groups = set()
+        elem_index = self._build_elem_index(group_name_to_group)
         
         for s1, t1, s2, t2, ix, iy in arrow_crossings:
-            g1 = self._find_group_for_element(s1, group_name_to_group)
-            g2 = self._find_group_for_element(s2, group_name_to_group)
+            g1 = self._find_group_for_element(s1, group_name_to_group, elem_index)
+            g2 = self._find_group_for_element(s2, group_name_to_group, elem_index)
             if g1:
                 conflicted_groups.add(g1)
             if g2:
                 conflicted_groups.add(g2)
         
         for source, target, name, nx, ny in arrow_through_text:
-            g_name = self._find_group_for_element(name, group_name_to_group)
+            g_name = self._find_group_for_element(name, group_name_to_group, elem_index)
             if g_name:
                 conflicted_groups.add(g_name)
         
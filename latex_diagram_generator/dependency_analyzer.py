@@ -170,14 +170,16 @@ class DependencyAnalyzer:
         Returns:
             Sorted list of group names
         """
-        groups_with_dest = [
-            (group_name, self.get_group_destination_x(group_name, outgoing, node_positions))
+        dest_x = {
+            group_name: self.get_group_destination_x(group_name, outgoing, node_positions)
             for group_name in groups
-        ]
+        }
         
-        # Sort by destination x position
-        groups_with_dest.sort(key=lambda x: (x[1], x[0]))
-        return [g[0] for g in groups_with_dest]
+        # Sort by name, then stably by destination x position: same order as a
+        # (dest_x, name) key without building and comparing a tuple per group
+        sorted_groups = sorted(groups)
+        sorted_groups.sort(key=dest_x.__getitem__)
+        return sorted_groups
     
     def find_group_target_in_set(self, group_name: str, group_names: List[str],
                                   outgoing: Dict) -> str:
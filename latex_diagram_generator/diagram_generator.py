@@ -1,4 +1,4 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 from .conflict_resolver import ConflictResolver
 from .layout_engine import LayoutEngine
@@ -11,13 +11,15 @@ class DiagramGenerator:
     # Import spacing constants
     from .spacing_constants import WITHIN_GROUP_SPACING, BETWEEN_GROUP_SPACING
     
-    def __init__(self, spec: Dict, template_path: str = 'templates/template.tex'):
+    def __init__(self, spec: Dict, template_path: str = 'templates/template.tex',
+                 template_text: Optional[str] = None):
         """
         Initialize the diagram generator with a specification.
         
         Args:
             spec: Dictionary containing 'groups' and 'links' keys
             template_path: Path to the LaTeX template file
+            template_text: Already loaded template content; skips reading template_path
         """
         self.spec = spec
         self.groups = spec.get('groups', [])
@@ -48,7 +50,7 @@ class DiagramGenerator:
         self.layout_engine = LayoutEngine(self.WITHIN_GROUP_SPACING, self.BETWEEN_GROUP_SPACING)
         
         # Initialize LaTeX generator
-        self.latex_generator = LaTeXGenerator(template_path, self.WITHIN_GROUP_SPACING)
+        self.latex_generator = LaTeXGenerator(template_path, self.WITHIN_GROUP_SPACING, template_text)
 
     @staticmethod
     def _round_coord(val):
@@ -204,6 +206,15 @@ class DiagramGenerator:
         Args:
             output_path: Path to write the new input file
         """
+        with open(output_path, 'w') as f:
+            f.write(self.get_input_with_positions())
+
+    def get_input_with_positions(self) -> str:
+        """
+        Render the input file with groups annotated with their rendered positions.
+        Returns:
+            Text format specification with an 'at (x, y)' on every placed group
+        """
         levels, positions = self._compute_layout_bottom_up()
         # Apply group position overrides so output matches rendered diagram
         self._apply_group_position_overrides(levels, positions)
@@ -240,8 +251,7 @@ class DiagramGenerator:
         lines.append('# Links')
         for source, target in self.links.items():
             lines.append(f'{source} -> {target}')
-        with open(output_path, 'w') as f:
-            f.write('\n'.join(lines) + '\n')
+        return '\n'.join(lines) + '\n'
 
     def _apply_group_position_overrides(self, levels, positions, node_positions=None):
         """
@@ -24,11 +24,15 @@ class GeometricHelper:
         Returns:
             True if segments intersect
         """
-        def ccw(ax, ay, bx, by, cx, cy):
-            return (cy - ay) * (bx - ax) > (by - ay) * (cx - ax)
-        
-        return (ccw(x1, y1, x3, y3, x4, y4) != ccw(x2, y2, x3, y3, x4, y4) and
-                ccw(x1, y1, x2, y2, x3, y3) != ccw(x1, y1, x2, y2, x4, y4))
+        # Orientation tests ccw(a, b, c) = (cy - ay) * (bx - ax) > (by - ay) * (cx - ax),
+        # written out inline since this runs for every candidate pair
+        p1_side = (y4 - y1) * (x3 - x1) > (y3 - y1) * (x4 - x1)
+        p2_side = (y4 - y2) * (x3 - x2) > (y3 - y2) * (x4 - x2)
+        if p1_side == p2_side:
+            return False
+        p3_side = (y3 - y1) * (x2 - x1) > (y2 - y1) * (x3 - x1)
+        p4_side = (y4 - y1) * (x2 - x1) > (y2 - y1) * (x4 - x1)
+        return p3_side != p4_side
     
     @staticmethod
     def line_intersects_box(x1, y1, x2, y2, box_min_x, box_min_y, box_max_x, box_max_y):
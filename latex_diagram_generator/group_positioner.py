@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 """Group positioning and collision detection."""
 
-from typing import Dict, List
+from bisect import insort
+from typing import Dict, List, Optional, Tuple
+
+# Visual separators inside a group; they take up a slot but are not nodes
+SEPARATOR_SYMBOLS = frozenset(['+', '-', '|'])
 
 
 class GroupPositioner:
@@ -9,13 +13,10 @@ class GroupPositioner:
 
     def place_group_at(self, group_name: str, x: float, y_level: int, levels: Dict, positions: Dict, node_positions: Dict):
         """Place a group at a specific x, y position and update node_positions."""
-        group = self.group_name_to_group[group_name]
-        elements = group.get('elements', [group_name])
+        elements = self.get_group_elements(group_name)
         levels[group_name] = y_level
         positions[group_name] = (x, elements)
-        for i, elem in enumerate(elements):
-            if elem not in ['+', '-', '|']:
-                node_positions[elem] = (elem, x + i * self.WITHIN_GROUP_SPACING, y_level)
+        self.store_node_positions(group_name, x, y_level, node_positions)
 
     def shift_group_horizontally(self, group_name: str, shift: float, positions: Dict, node_positions: Dict):
         """Shift a group and its elements horizontally by shift units."""
@@ -42,6 +43,9 @@ class GroupPositioner:
         self.WITHIN_GROUP_SPACING = within_group_spacing
         self.BETWEEN_GROUP_SPACING = between_group_spacing
         self.MAX_X_POSITION = 40.0  # Maximum horizontal position allowed
+        self._group_widths = {}  # group_name -> width, filled on first use
+        self._group_elements = {}  # group_name -> element list, filled on first use
+        self._group_nodes = {}  # group_name -> (index, elem) pairs, filled on first use
     
     def calculate_group_width(self, elements: List[str]) -> float:
         """
@@ -57,6 +61,80 @@ class GroupPositioner:
             return (len(elements) - 1) * self.WITHIN_GROUP_SPACING
         return 0.0
     
+    def get_group_width(self, group_name: str) -> float:
+        """
+        Get the width of a named group, computing it only once per group.
+        
+        Args:
+            group_name: Name of the group
+            
+        Returns:
+            Width in coordinate units
+        """
+        width = self._group_widths.get(group_name)
+        if width is None:
+            group = self.group_name_to_group[group_name]
+            width = self.calculate_group_width(group['elements']) if 'elements' in group else 0.0
+            self._group_widths[group_name] = width
+        return width
+    
+    def get_group_elements(self, group_name: str) -> List[str]:
+        """
+        Get the elements of a named group; a group without elements is its own
+        single element. The fallback list is built once per group.
+        
+        Args:
+            group_name: Name of the group
+            
+        Returns:
+            List of element names
+        """
+        elements = self._group_elements.get(group_name)
+        if elements is None:
+            elements = self.group_name_to_group[group_name].get('elements', [group_name])
+            self._group_elements[group_name] = elements
+        return elements
+    
+    def get_group_nodes(self, group_name: str) -> Tuple[Tuple[int, str], ...]:
+        """
+        Get (slot index, element) pairs for the elements of a group that are
+        drawn as nodes, skipping separator symbols. Built once per group.
+        
+        Args:
+            group_name: Name of the group
+            
+        Returns:
+            Tuple of (index, element name) pairs
+        """
+        nodes = self._group_nodes.get(group_name)
+        if nodes is None:
+            nodes = tuple(
+                (i, elem) for i, elem in enumerate(self.get_group_elements(group_name))
+                if elem not in SEPARATOR_SYMBOLS
+            )
+            self._group_nodes[group_name] = nodes
+        return nodes
+    
+    def store_node_positions(self, group_name: str, start_x: float, y_level: float,
+                             node_positions: Dict) -> None:
+        """
+        Record (elem, x, y) for every node of a group starting at start_x.
+        
+        Args:
+            group_name: Name of the group
+            start_x: X-coordinate of the group's first slot
+            y_level: Y-coordinate of the group
+            node_positions: Dict to update
+        """
+        nodes = self.get_group_nodes(group_name)
+        if len(nodes) == 1:
+            # Single-node groups (the common case) need no batch
+            i, elem = nodes[0]
+            node_positions[elem] = (elem, start_x + i * self.WITHIN_GROUP_SPACING, y_level)
+            return
+        spacing = self.WITHIN_GROUP_SPACING
+        node_positions.update([(elem, (elem, start_x + i * spacing, y_level)) for i, elem in nodes])
+    
     def calculate_group_widths(self, group_names: List[str]) -> List[float]:
         """
         Calculate widths for a list of groups.
@@ -67,16 +145,7 @@ class GroupPositioner:
         Returns:
             List of group widths
         """
-        group_widths = []
-        for group_name in group_names:
-            group = self.group_name_to_group[group_name]
-            if 'elements' in group:
-                num_elements = len(group['elements'])
-                width = (num_elements - 1) * self.WITHIN_GROUP_SPACING if num_elements > 1 else 0
-            else:
-                width = 0
-            group_widths.append(width)
-        return group_widths
+        return [self.get_group_width(group_name) for group_name in group_names]
     
     def calculate_starting_x(self, group_names: List[str], group_widths: List[float], center: bool) -> float:
         """
@@ -110,17 +179,11 @@ class GroupPositioner:
         Returns:
             Next x-coordinate for subsequent groups
         """
-        group = self.group_name_to_group[group_name]
-        elements = group.get('elements', [group_name])
+        elements = self.get_group_elements(group_name)
         
         levels[group_name] = y_level
         positions[group_name] = (current_x, elements)
-        
-        for i, elem in enumerate(elements):
-            # Skip special symbols like '+' - they're visual separators, not nodes
-            if elem not in ['+', '-', '|']:
-                # Always assign as (elem, x, y_level)
-                node_positions[elem] = (elem, current_x + i * self.WITHIN_GROUP_SPACING, y_level)
+        self.store_node_positions(group_name, current_x, y_level, node_positions)
         
         return current_x + width + self.BETWEEN_GROUP_SPACING  # Move to next group position
     
@@ -157,8 +220,60 @@ class GroupPositioner:
         
         return adjusted_x
     
+    def collect_row_intervals(self, y_level: int, levels: Dict, positions: Dict,
+                              exclude=()) -> List[Tuple[float, float]]:
+        """
+        Collect the spans of groups already placed on a row.
+        
+        Args:
+            y_level: Y-level of the row
+            levels: Dict of group levels
+            positions: Dict of group positions
+            exclude: Group names to leave out
+            
+        Returns:
+            List of (start_x, end_x) tuples sorted by start_x
+        """
+        intervals = []
+        for other_group, other_level in levels.items():
+            if other_level == y_level and other_group not in exclude:
+                other_start, other_elements = positions[other_group]
+                intervals.append((other_start, other_start + self.calculate_group_width(other_elements)))
+        intervals.sort()
+        return intervals
+    
+    def adjust_position_for_row_intervals(self, start_x: float, width: float,
+                                          intervals: List[Tuple[float, float]]) -> float:
+        """
+        Adjust group position to avoid collisions, using the sorted spans of its row.
+        
+        Spans can overlap (e.g. several groups centred on the same target), so an
+        earlier, wider span may still cover start_x: the scan starts at the left
+        end of the row and stops at the first span wholly right of the group.
+        
+        Args:
+            start_x: Desired starting x position
+            width: Width of the group
+            intervals: Sorted (start_x, end_x) spans from collect_row_intervals
+            
+        Returns:
+            Adjusted starting x position
+        """
+        REQUIRED_SPACING = 2.0
+        adjusted_x = start_x
+        
+        for other_start, other_end in intervals:
+            if adjusted_x + width + REQUIRED_SPACING < other_start:
+                break
+            if adjusted_x <= other_end + REQUIRED_SPACING:
+                # Overlap detected! Shift right
+                adjusted_x = other_end + REQUIRED_SPACING
+        
+        return adjusted_x
+    
     def place_single_group_centered(self, group_name: str, y_level: int, target_x: float,
-                                     levels: Dict, positions: Dict, node_positions: Dict):
+                                     levels: Dict, positions: Dict, node_positions: Dict,
+                                     row_intervals: Optional[List[Tuple[float, float]]] = None):
         """
         Place a single group centered above its target with collision avoidance.
         
@@ -167,26 +282,25 @@ class GroupPositioner:
             y_level: Y-level for placement
             target_x: Target x position to center on
             levels, positions, node_positions: Dicts to update
+            row_intervals: Optional sorted spans of the row (see collect_row_intervals);
+                updated with the placed group
         """
-        group = self.group_name_to_group[group_name]
-        elements = group.get('elements', [group_name])
-        
-        # Get target position and calculate group width
-        width = self.calculate_group_width(elements)
+        elements = self.get_group_elements(group_name)
+        width = self.get_group_width(group_name)
         
         # Center above target
         start_x = target_x - width / 2.0
         
         # Adjust for collisions
-        start_x = self.adjust_position_for_collisions(
-            start_x, width, y_level, group_name, levels, positions
-        )
+        if row_intervals is None:
+            start_x = self.adjust_position_for_collisions(
+                start_x, width, y_level, group_name, levels, positions
+            )
+        else:
+            start_x = self.adjust_position_for_row_intervals(start_x, width, row_intervals)
+            insort(row_intervals, (start_x, start_x + width))
         
         # Update positions
         levels[group_name] = y_level
         positions[group_name] = (start_x, elements)
-        
-        for i, elem in enumerate(elements):
-            # Skip special symbols like '+' - they're visual separators, not nodes
-            if elem not in ['+', '-', '|']:
-                node_positions[elem] = (elem, start_x + i * self.WITHIN_GROUP_SPACING, y_level)
+        self.store_node_positions(group_name, start_x, y_level, node_positions)
@@ -2,7 +2,7 @@
 """LaTeX code generation for diagrams."""
 
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Import spacing constants
 from .spacing_constants import WITHIN_GROUP_SPACING, TARGET_WIDTH_CM, X_SPACING_MIN, X_SPACING_MAX, X_SPACING_DEFAULT
@@ -17,15 +17,18 @@ class LaTeXGenerator:
             return int(round(val))
         return round(val, 1)
     
-    def __init__(self, template_path: str, within_group_spacing: float = WITHIN_GROUP_SPACING):
+    def __init__(self, template_path: str, within_group_spacing: float = WITHIN_GROUP_SPACING,
+                 template_text: Optional[str] = None):
         """
         Initialize the LaTeX generator.
         
         Args:
             template_path: Path to LaTeX template file
             within_group_spacing: Spacing between elements within groups
+            template_text: Already loaded template content; skips reading template_path
         """
         self.template_path = template_path
+        self.template_text = template_text
         self.WITHIN_GROUP_SPACING = within_group_spacing
     
     def _calculate_spacing_and_font(self, positions: Dict) -> Tuple[float, int]:
@@ -348,6 +351,8 @@ class LaTeXGenerator:
         Raises:
             FileNotFoundError: If template file doesn't exist
         """
+        if self.template_text is not None:
+            return self.template_text
         try:
             with open(self.template_path, 'r') as f:
                 return f.read()
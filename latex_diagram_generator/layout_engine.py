@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Layout engine for computing diagram layout."""
 
+import logging
+from collections import deque
 from typing import Dict, List, Tuple, Set
 from .dependency_analyzer import DependencyAnalyzer
 from .group_positioner import GroupPositioner
@@ -10,11 +12,15 @@ from .row_placer import RowPlacer
 # Import spacing constants
 from .spacing_constants import WITHIN_GROUP_SPACING, BETWEEN_GROUP_SPACING
 
+_log = logging.getLogger(__name__)
 
 
 class LayoutEngine:
     """Handles layout computation for diagram elements."""
 
+    MAX_ORDERING_TRIALS = 200  # Orderings tried per layer when minimizing crossings
+    SELECT_SORT_THRESHOLD = 16  # Below this many values a plain sort beats quickselect
+
     def __init__(self, within_group_spacing: float = WITHIN_GROUP_SPACING, between_group_spacing: float = BETWEEN_GROUP_SPACING):
         self.WITHIN_GROUP_SPACING = within_group_spacing
         self.BETWEEN_GROUP_SPACING = between_group_spacing
@@ -24,6 +30,90 @@ class LayoutEngine:
         self.positioner = None
         self.bottom_placer = None
         self.row_placer = None
+        self._group_elements = None
+
+    @staticmethod
+    def _normalize_links(links):
+        """
+        Return a copy of a link mapping with every value as a list.
+        
+        Links may map to a single name or to a list of names; the layout
+        entry points normalize once so downstream helpers can iterate
+        targets directly.
+        
+        Args:
+            links: Dictionary mapping element names to a name or list of names
+            
+        Returns:
+            Dictionary mapping element names to lists of names
+        """
+        return {k: (v if isinstance(v, list) else [v]) for k, v in links.items()}
+
+    @staticmethod
+    def _pick_cycle_breaker(groups, layered, group_targets):
+        """
+        Choose the group at which to break a cycle once no group is ready.
+        
+        Finds the strongly connected components of the unlayered groups and
+        returns the first group (in the given order) whose component has no
+        links coming in from other unlayered components. Every unlayered group
+        linking into it is then on its own cycle, so only links that close that
+        cycle are left pointing upward; groups downstream of a cycle keep
+        waiting for it instead of being forced.
+        
+        Args:
+            groups: Groups in layering order
+            layered: Set of groups already layered
+            group_targets: Dictionary mapping a group to the set of groups it links to
+            
+        Returns:
+            Name of the group to force onto the frontier
+        """
+        remaining = [g for g in groups if g not in layered]
+        # Iterative Tarjan: component id per group
+        index = {}
+        low = {}
+        component = {}
+        stack = []
+        on_stack = set()
+        for root in remaining:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(group_targets.get(root, ())))]
+            while work:
+                node, targets = work[-1]
+                for tgt in targets:
+                    if tgt in layered:
+                        continue
+                    if tgt not in index:
+                        index[tgt] = low[tgt] = len(index)
+                        stack.append(tgt)
+                        on_stack.add(tgt)
+                        work.append((tgt, iter(group_targets.get(tgt, ()))))
+                        break
+                    if tgt in on_stack and index[tgt] < low[node]:
+                        low[node] = index[tgt]
+                else:
+                    work.pop()
+                    if work and low[node] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[node]
+                    if low[node] == index[node]:
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component[member] = node
+                            if member == node:
+                                break
+        # Components reached from another unlayered component are not sources
+        entered = set()
+        for src in remaining:
+            for tgt in group_targets.get(src, ()):
+                if tgt not in layered and component[tgt] != component[src]:
+                    entered.add(component[tgt])
+        return next(g for g in remaining if component[g] not in entered)
 
     def _initialize_layout(self, group_name_to_group, element_to_group):
         """
@@ -36,6 +126,10 @@ class LayoutEngine:
         """
         self.group_name_to_group = group_name_to_group
         self.element_to_group = element_to_group
+        # Element lists per group (a group without 'elements' is its own single element)
+        self._group_elements = {
+            g: tuple(go.get('elements', [g])) for g, go in group_name_to_group.items()
+        }
         # Initialize helper components
         self.analyzer = DependencyAnalyzer(group_name_to_group, element_to_group)
         self.positioner = GroupPositioner(group_name_to_group, self.WITHIN_GROUP_SPACING, self.BETWEEN_GROUP_SPACING)
@@ -58,6 +152,7 @@ class LayoutEngine:
         self.positioner = None
         self.bottom_placer = None
         self.row_placer = None
+        self._group_elements = None
 
     def compute_layout_bottom_up_arrow_aware(self, group_name_to_group, element_to_group, outgoing, incoming, conflict_detector) -> Tuple[Dict[str, int], Dict[str, Tuple[float, List[str]]]]:
         """Compute layout bottom-up, using backtracking to find the best group ordering per level to minimize crossings."""
@@ -69,6 +164,7 @@ class LayoutEngine:
             Repeat for a few passes.
             """
             import copy
+            spacing = self.WITHIN_GROUP_SPACING
             group_y_to_names = {}
             for g, y in levels.items():
                 group_y_to_names.setdefault(y, []).append(g)
@@ -91,10 +187,10 @@ class LayoutEngine:
                         # Update node_positions for all elements in g1 and g2
                         for idx, elem in enumerate(elems1):
                             if elem in node_pos_copy:
-                                node_pos_copy[elem] = (elem, x2 + idx * self.WITHIN_GROUP_SPACING, node_pos_copy[elem][2])
+                                node_pos_copy[elem] = (elem, x2 + idx * spacing, node_pos_copy[elem][2])
                         for idx, elem in enumerate(elems2):
                             if elem in node_pos_copy:
-                                node_pos_copy[elem] = (elem, x1 + idx * self.WITHIN_GROUP_SPACING, node_pos_copy[elem][2])
+                                node_pos_copy[elem] = (elem, x1 + idx * spacing, node_pos_copy[elem][2])
                         # Count crossings before and after
                         arrows_before = self._collect_arrows(node_positions, outgoing)
                         arrows_after = self._collect_arrows(node_pos_copy, outgoing)
@@ -114,45 +210,53 @@ class LayoutEngine:
                     break
         # ...existing code...
         all_groups, levels, positions, node_positions, placed_groups, current_y = self._initialize_layout(group_name_to_group, element_to_group)
+        outgoing = self._normalize_links(outgoing)
+        incoming = self._normalize_links(incoming)
         analyzer = DependencyAnalyzer(group_name_to_group, element_to_group)
         group_input_order = list(group_name_to_group.keys())
-        # Build group-to-group dependency graph
-        group_dependencies = {g: set() for g in all_groups}
-        for src_group in all_groups:
-            src_obj = group_name_to_group[src_group]
-            src_elems = src_obj.get('elements', [src_group])
-            for elem in src_elems:
-                if elem in outgoing:
-                    tgts = outgoing[elem]
-                    if not isinstance(tgts, list):
-                        tgts = [tgts]
-                    for tgt in tgts:
-                        if tgt in element_to_group:
-                            tgt_group = element_to_group[tgt]
-                            if tgt_group != src_group:
-                                group_dependencies[tgt_group].add(src_group)
         # Assign layer indices to ensure all arrows go down, with back-propagation
-        group_layer = {g: 0 for g in all_groups}
+        group_layer = {g: 0 for g in group_input_order}
         # Add standalone elements as their own groups for layering
         for elem in outgoing:
             if elem not in element_to_group:
                 group_layer[elem] = 0
-        changed = True
-        while changed:
-            changed = False
-            for src_elem, tgts in outgoing.items():
-                if not isinstance(tgts, list):
-                    tgts = [tgts]
-                src_group = element_to_group[src_elem] if src_elem in element_to_group else src_elem
-                src_layer = group_layer[src_group]
-                for tgt in tgts:
-                    tgt_group = element_to_group[tgt] if tgt in element_to_group else tgt
-                    if tgt_group not in group_layer:
-                        group_layer[tgt_group] = 0
-                    # Enforce: tgt_group must be strictly above src_group
-                    if group_layer[tgt_group] <= src_layer:
-                        group_layer[tgt_group] = src_layer + 1
-                        changed = True
+        # Longest-path layering with Kahn's algorithm: each group is layered
+        # once all groups linking into it are, so every edge is relaxed once
+        group_targets = {}
+        for src_elem, tgts in outgoing.items():
+            src_group = element_to_group.get(src_elem, src_elem)
+            for tgt in tgts:
+                tgt_group = element_to_group.get(tgt, tgt)
+                if tgt_group not in group_layer:
+                    group_layer[tgt_group] = 0
+                group_targets.setdefault(src_group, set()).add(tgt_group)
+        in_degree = dict.fromkeys(group_layer, 0)
+        for tgt_groups in group_targets.values():
+            for tgt_group in tgt_groups:
+                in_degree[tgt_group] += 1
+        frontier = deque(g for g, degree in in_degree.items() if degree == 0)
+        layered = set()
+        back_edges = set()  # (src_group, tgt_group) links that close a cycle
+        while len(layered) < len(group_layer):
+            if not frontier:
+                # Only cycles remain: break one at a group whose unlayered
+                # predecessors all lie on its own cycle
+                forced = self._pick_cycle_breaker(group_layer, layered, group_targets)
+                in_degree[forced] = 0
+                frontier.append(forced)
+            src_group = frontier.popleft()
+            layered.add(src_group)
+            next_layer = group_layer[src_group] + 1
+            for tgt_group in group_targets.get(src_group, ()):
+                if tgt_group in layered:
+                    back_edges.add((src_group, tgt_group))
+                    continue
+                # Enforce: tgt_group must be strictly above src_group
+                if group_layer[tgt_group] < next_layer:
+                    group_layer[tgt_group] = next_layer
+                in_degree[tgt_group] -= 1
+                if in_degree[tgt_group] == 0:
+                    frontier.append(tgt_group)
         # Build layers from group_layer mapping
         max_layer = max(group_layer.values())
         # Only include real groups in layers (not standalone elements)
@@ -163,16 +267,27 @@ class LayoutEngine:
 
         num_layers = len(layers)
         y_spacing = 2.0  # Increased vertical spacing between rows
+        # Bound once; the ordering trials below run these many times per layer
+        place_group_at = self.positioner.place_group_at
+        get_group_width = self.positioner.get_group_width
+        between_spacing = self.BETWEEN_GROUP_SPACING
+        collect_arrows = self._collect_arrows
+        count_crossings = self._count_crossings
         # Assign y-levels so that the highest layer index is at the top (y=0), lower indices further down
         for layer_idx, layer in enumerate(layers):
             y_level = layer_idx * y_spacing
             best_order = None
             min_crossings = float('inf')
-            # Try all orderings if small, else use input order
+            # Try orderings closest to the barycenter order first so the early
+            # break on zero crossings is reached quickly; large layers only
+            # try the barycenter order itself.
+            barycenters = self._layer_barycenters(layer, outgoing, incoming, node_positions)
             if len(layer) <= 8:
-                perms = list(itertools.permutations(layer))
+                perms = itertools.islice(
+                    self._orderings_by_barycenter(layer, barycenters), self.MAX_ORDERING_TRIALS
+                )
             else:
-                perms = [layer]
+                perms = (tuple(sorted(layer, key=barycenters.get)),)
             for ordering in perms:
                 # Copy state for trial
                 trial_levels = dict(levels)
@@ -180,12 +295,12 @@ class LayoutEngine:
                 trial_node_positions = dict(node_positions)
                 x = 0.0
                 for group in ordering:
-                    self.positioner.place_group_at(group, x, y_level, trial_levels, trial_positions, trial_node_positions)
-                    x += self.positioner.calculate_group_widths([group])[0] + self.BETWEEN_GROUP_SPACING
-                arrows = self._collect_arrows(trial_node_positions, outgoing)
-                crossings = conflict_detector.check_arrow_crossings(arrows)
-                if len(crossings) < min_crossings:
-                    min_crossings = len(crossings)
+                    place_group_at(group, x, y_level, trial_levels, trial_positions, trial_node_positions)
+                    x += get_group_width(group) + between_spacing
+                arrows = collect_arrows(trial_node_positions, outgoing)
+                crossings = count_crossings(arrows, conflict_detector)
+                if crossings < min_crossings:
+                    min_crossings = crossings
                     best_order = ordering
                     best_trial = (dict(trial_levels), dict(trial_positions), dict(trial_node_positions))
                     if min_crossings == 0:
@@ -206,20 +321,20 @@ class LayoutEngine:
                     if isinstance(node_positions[elem], tuple) and len(node_positions[elem]) == 3:
                         node_y[elem] = node_positions[elem][2]
 
-        non_downward_arrows = []
-        for src_elem in outgoing:
-            tgts = outgoing[src_elem]
-            if not isinstance(tgts, list):
-                tgts = [tgts]
+        # Stop at the first violation - one is enough to reject the layout
+        for src_elem, tgts in outgoing.items():
+            src_y = node_y.get(src_elem)
+            if src_y is None:
+                continue
             for tgt in tgts:
-                if src_elem in node_y and tgt in node_y:
-                    if node_y[src_elem] >= node_y[tgt]:
-                        non_downward_arrows.append((src_elem, node_y[src_elem], tgt, node_y[tgt]))
-        if non_downward_arrows:
-            msg = ["ERROR: Non-downward arrows detected (vertical or upward):"]
-            for src, y1, tgt, y2 in non_downward_arrows:
-                msg.append(f"  Arrow from {src} (y={y1}) to {tgt} (y={y2}) is not strictly downward!")
-            raise RuntimeError("\n".join(msg))
+                tgt_y = node_y.get(tgt)
+                if tgt_y is not None and src_y >= tgt_y:
+                    if (element_to_group.get(src_elem, src_elem), element_to_group.get(tgt, tgt)) in back_edges:
+                        continue  # A cycle cannot point downward everywhere
+                    raise RuntimeError(
+                        "ERROR: Non-downward arrows detected (vertical or upward):\n"
+                        f"  Arrow from {src_elem} (y={src_y}) to {tgt} (y={tgt_y}) is not strictly downward!"
+                    )
         return levels, positions
 
     def _resolve_crossings_recursive(self, node_positions, outgoing, conflict_detector, levels, positions, node_positions_ref, prev_y_level, max_depth=10, shifted_groups=None):
@@ -245,22 +360,22 @@ class LayoutEngine:
             # Shift both groups apart if possible, and try larger shifts if already shifted
             if g1 and g2 and g1 != g2:
                 if (g1, prev_y_level) not in shifted_groups:
-                    print(f"  → Shifting {g1} left by 1.5 to resolve crossing")
+                    _log.debug("  → Shifting %s left by 1.5 to resolve crossing", g1)
                     self.positioner.shift_group_horizontally(g1, -1.5, positions, node_positions_ref)
                     shifted_groups.add((g1, prev_y_level))
                     did_shift = True
                 if (g2, prev_y_level) not in shifted_groups:
-                    print(f"  → Shifting {g2} right by 1.5 to resolve crossing")
+                    _log.debug("  → Shifting %s right by 1.5 to resolve crossing", g2)
                     self.positioner.shift_group_horizontally(g2, 1.5, positions, node_positions_ref)
                     shifted_groups.add((g2, prev_y_level))
                     did_shift = True
             elif g1 and (g1, prev_y_level) not in shifted_groups:
-                print(f"  → Shifting {g1} right by 2.0 to resolve crossing")
+                _log.debug("  → Shifting %s right by 2.0 to resolve crossing", g1)
                 self.positioner.shift_group_horizontally(g1, 2.0, positions, node_positions_ref)
                 shifted_groups.add((g1, prev_y_level))
                 did_shift = True
             elif g2 and (g2, prev_y_level) not in shifted_groups:
-                print(f"  → Shifting {g2} left by 2.0 to resolve crossing")
+                _log.debug("  → Shifting %s left by 2.0 to resolve crossing", g2)
                 self.positioner.shift_group_horizontally(g2, -2.0, positions, node_positions_ref)
                 shifted_groups.add((g2, prev_y_level))
                 did_shift = True
@@ -271,16 +386,62 @@ class LayoutEngine:
     def _collect_arrows(self, node_positions, outgoing):
         """Collect all arrows as (source, sx, sy, target, tx, ty) tuples for crossing detection."""
         arrows = []
+        append = arrows.append
         for source, targets in outgoing.items():
-            if not isinstance(targets, list):
-                targets = [targets]
+            source_pos = node_positions.get(source)
+            if source_pos is None:
+                continue
+            sx, sy = source_pos[1], source_pos[2]
             for target in targets:
-                if source in node_positions and target in node_positions:
-                    sx, sy = node_positions[source][1], node_positions[source][2]
-                    tx, ty = node_positions[target][1], node_positions[target][2]
-                    arrows.append((source, sx, sy, target, tx, ty))
+                target_pos = node_positions.get(target)
+                if target_pos is not None:
+                    append((source, sx, sy, target, target_pos[1], target_pos[2]))
         return arrows
 
+    def _layer_barycenters(self, layer, outgoing, incoming, node_positions):
+        """Mean x-position of each group's already placed neighbours (inf when there are none)."""
+        barycenters = {}
+        for group in layer:
+            xs = []
+            for elem in self._group_elements[group]:
+                for links in (outgoing.get(elem), incoming.get(elem)):
+                    if not links:
+                        continue
+                    for other in links:
+                        if other in node_positions:
+                            xs.append(node_positions[other][1])
+            barycenters[group] = sum(xs) / len(xs) if xs else float('inf')
+        return barycenters
+
+    def _orderings_by_barycenter(self, layer, barycenters):
+        """
+        Yield orderings of a layer by increasing distance from its barycenter order.
+        
+        The barycenter order comes first, followed by a breadth-first walk over
+        adjacent swaps, so orderings appear in Kendall-tau distance order.
+        """
+        seed = tuple(sorted(layer, key=barycenters.get))
+        seen = {seed}
+        queue = deque([seed])
+        while queue:
+            ordering = queue.popleft()
+            yield ordering
+            for i in range(len(ordering) - 1):
+                swapped = ordering[:i] + (ordering[i + 1], ordering[i]) + ordering[i + 2:]
+                if swapped not in seen:
+                    seen.add(swapped)
+                    queue.append(swapped)
+
+    def _count_crossings(self, arrows, conflict_detector):
+        """Count arrow crossings, using the row inversion counter when all arrows span the same two rows."""
+        if arrows:
+            rows = {(sy, ty) for _, _, sy, _, _, ty in arrows}
+            if len(rows) == 1:
+                sy, ty = rows.pop()
+                if sy != ty:
+                    return conflict_detector.count_row_crossings(arrows)
+        return len(conflict_detector.check_arrow_crossings(arrows))
+
     def _resolve_crossings_by_shifting(self, crossings, levels, positions, node_positions, prev_y_level):
         """Shift groups on the previous row left/right to resolve crossings. Propagate recursively if needed."""
         if prev_y_level < 0:
@@ -302,14 +463,16 @@ class LayoutEngine:
     def _collect_arrows(self, node_positions, outgoing):
         """Collect all arrows as (source, sx, sy, target, tx, ty) tuples for crossing detection."""
         arrows = []
+        append = arrows.append
         for source, targets in outgoing.items():
-            if not isinstance(targets, list):
-                targets = [targets]
+            source_pos = node_positions.get(source)
+            if source_pos is None:
+                continue
+            sx, sy = source_pos[1], source_pos[2]
             for target in targets:
-                if source in node_positions and target in node_positions:
-                    sx, sy = node_positions[source][1], node_positions[source][2]
-                    tx, ty = node_positions[target][1], node_positions[target][2]
-                    arrows.append((source, sx, sy, target, tx, ty))
+                target_pos = node_positions.get(target)
+                if target_pos is not None:
+                    append((source, sx, sy, target, target_pos[1], target_pos[2]))
         return arrows
 
     def _resolve_crossings_by_shifting(self, crossings, levels, positions, node_positions, prev_y_level):
@@ -346,8 +509,8 @@ class LayoutEngine:
             Updated current_y (max y-level used)
         """
         bottom_groups = self.analyzer.find_bottom_groups(all_groups, outgoing)
-        print(f"\n=== Bottom-Up Layout ===")
-        print(f"Bottom groups: {bottom_groups}")
+        _log.debug("=== Bottom-Up Layout ===")
+        _log.debug("Bottom groups: %s", bottom_groups)
         
         # Find dependencies among bottom groups
         source_to_target = self.analyzer.find_bottom_group_dependencies(bottom_groups, outgoing)
@@ -386,7 +549,7 @@ class LayoutEngine:
         if not next_groups:
             return []
         
-        print(f"\nIteration {iteration}: Processing {len(next_groups)} groups")
+        _log.debug("Iteration %d: Processing %d groups", iteration, len(next_groups))
         
         # Sort groups by destination position and place them
         sorted_groups = self.analyzer.sort_groups_by_destination(next_groups, outgoing, node_positions)
@@ -415,15 +578,18 @@ class LayoutEngine:
         # Initialize data structures
         all_groups, levels, positions, node_positions, placed_groups, current_y = \
             self._initialize_layout(group_name_to_group, element_to_group)
+        outgoing = self._normalize_links(outgoing)
+        incoming = self._normalize_links(incoming)
         
-        print("\n=== Strict Layered Layout (Zero Overlaps) ===")
+        _log.debug("=== Strict Layered Layout (Zero Overlaps) ===")
         
         # Compute topological layers
         layers = self._compute_topological_layers(all_groups, outgoing, incoming)
         
-        print(f"Computed {len(layers)} topological layers:")
-        for i, layer in enumerate(layers):
-            print(f"  Layer {i}: {layer}")
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("Computed %d topological layers:", len(layers))
+            for i, layer in enumerate(layers):
+                _log.debug("  Layer %d: %s", i, layer)
         
         # Place each layer on its own row with crossing minimization
         # Use larger vertical spacing to accommodate row wrapping within layers
@@ -437,7 +603,7 @@ class LayoutEngine:
             # Move to next layer with spacing for arrows to pass cleanly
             current_y += num_rows_in_layer + 1
         
-        print(f"\n=== Layout Complete: {len(placed_groups)} groups placed ===")
+        _log.debug("=== Layout Complete: %d groups placed ===", len(placed_groups))
         return levels, positions
     
     def _compute_topological_layers(self, all_groups, outgoing, incoming):
@@ -449,81 +615,29 @@ class LayoutEngine:
         """
         # Compute longest path from each group (its depth)
         group_depth = {}
+        has_outgoing, group_sources = self._build_group_sources(all_groups, outgoing)
         
         # Find groups with no outgoing links (bottom layer)
-        bottom_groups = []
-        for group in all_groups:
-            has_outgoing = False
-            group_obj = self.group_name_to_group[group]
-            
-            # Check if any element in the group has outgoing links
-            if 'elements' in group_obj:
-                for elem in group_obj['elements']:
-                    if elem in outgoing:
-                        has_outgoing = True
-                        break
-            
-            # Also check if the group itself has outgoing links
-            if group in outgoing:
-                has_outgoing = True
-            
-            if not has_outgoing:
-                bottom_groups.append(group)
-                group_depth[group] = 0
+        bottom_groups = [g for g in all_groups if g not in has_outgoing]
+        for group in bottom_groups:
+            group_depth[group] = 0
         
         # BFS to compute depth of each group
-        queue = list(bottom_groups)
+        queue = deque(bottom_groups)
         visited = set(bottom_groups)
         
         while queue:
-            current = queue.pop(0)
-            current_depth = group_depth[current]
+            current = queue.popleft()
+            new_depth = group_depth[current] + 1
             
-            # Find groups that point to current group
-            for group in all_groups:
+            # Groups that point to current group
+            for group in group_sources.get(current, ()):
                 if group in visited:
                     continue
-                
-                group_obj = self.group_name_to_group[group]
-                points_to_current = False
-                
-                # Check element-level outgoing links
-                if 'elements' in group_obj:
-                    for elem in group_obj['elements']:
-                        if elem in outgoing:
-                            targets = outgoing[elem]
-                            if not isinstance(targets, list):
-                                targets = [targets]
-                            
-                            # Check if any target is in current group
-                            current_obj = self.group_name_to_group[current]
-                            if 'elements' in current_obj:
-                                if any(t in current_obj['elements'] for t in targets):
-                                    points_to_current = True
-                                    break
-                            elif current in targets or any(t == current for t in targets):
-                                points_to_current = True
-                                break
-                
-                # Also check group-level outgoing links
-                if not points_to_current and group in outgoing:
-                    targets = outgoing[group]
-                    if not isinstance(targets, list):
-                        targets = [targets]
-                    current_obj = self.group_name_to_group[current]
-                    if 'elements' in current_obj:
-                        if any(t in current_obj['elements'] for t in targets):
-                            points_to_current = True
-                    elif current in targets:
-                        points_to_current = True
-                
-                if points_to_current:
-                    new_depth = current_depth + 1
-                    if group not in group_depth or group_depth[group] < new_depth:
-                        group_depth[group] = new_depth
-                    if group not in visited:
-                        visited.add(group)
-                        queue.append(group)
+                if group not in group_depth or group_depth[group] < new_depth:
+                    group_depth[group] = new_depth
+                visited.add(group)
+                queue.append(group)
         
         # Handle circular dependencies: place unvisited groups at depth 0
         for group in all_groups:
@@ -539,6 +653,37 @@ class LayoutEngine:
         
         return layers
     
+    def _build_group_sources(self, all_groups, outgoing):
+        """
+        Build group-level adjacency for topological layering in one pass.
+        
+        Args:
+            all_groups: Set of all group names
+            outgoing: Normalized dictionary of outgoing links
+            
+        Returns:
+            Tuple of (set of groups with any outgoing link, dict mapping each
+            group to the groups linking into it, in all_groups order)
+        """
+        group_elements = self._group_elements
+        owners = {}
+        for group in all_groups:
+            for elem in group_elements[group]:
+                owners.setdefault(elem, []).append(group)
+        
+        has_outgoing = set()
+        group_sources = {}
+        for group in all_groups:
+            # The group itself and each of its elements may carry links
+            sources = [group] + [e for e in group_elements[group] if e != group]
+            targets = [t for e in sources if e in outgoing for t in outgoing[e]]
+            if any(e in outgoing for e in sources):
+                has_outgoing.add(group)
+            target_groups = {g for t in targets for g in owners.get(t, ())}
+            for target_group in target_groups:
+                group_sources.setdefault(target_group, []).append(group)
+        return has_outgoing, group_sources
+    
     def _place_layer_with_crossing_minimization(self, layer_groups, y_level, levels, 
                                                 positions, node_positions, outgoing, 
                                                 incoming, placed_groups):
@@ -570,7 +715,7 @@ class LayoutEngine:
         for i, row_groups in enumerate(rows):
             row_y = y_level + i
             self.row_placer.place_groups_on_row(row_groups, row_y, levels, positions, node_positions, force_sequential=True)
-            print(f"  Layer {y_level} row {i}: {row_groups} at y={row_y}")
+            _log.debug("  Layer %s row %d: %s at y=%s", y_level, i, row_groups, row_y)
         
         return len(rows)
     
@@ -584,7 +729,7 @@ class LayoutEngine:
         current_x = 0.0
         
         for group in ordered_groups:
-            group_width = self.positioner.calculate_group_widths([group])[0]
+            group_width = self.positioner.get_group_width(group)
             
             # Check if adding this group would exceed MAX_X_POSITION
             if current_row and current_x + self.positioner.BETWEEN_GROUP_SPACING + group_width > self.positioner.MAX_X_POSITION:
@@ -606,36 +751,45 @@ class LayoutEngine:
     
     def _compute_median_target_x(self, group, outgoing, node_positions):
         """Compute the median x-position of this group's targets."""
-        target_positions = []
-        group_obj = self.group_name_to_group[group]
-        
-        # Collect target positions
-        if 'elements' in group_obj:
-            for elem in group_obj['elements']:
-                if elem in outgoing:
-                    targets = outgoing[elem]
-                    if not isinstance(targets, list):
-                        targets = [targets]
-                    for target in targets:
-                        if target in node_positions:
-                            if isinstance(node_positions[target], tuple):
-                                target_positions.append(node_positions[target][1])  # (node_id, x, y)
-                            else:
-                                target_positions.append(node_positions[target])
-        elif group in outgoing:
-            targets = outgoing[group]
-            if not isinstance(targets, list):
-                targets = [targets]
-            for target in targets:
-                if target in node_positions:
-                    if isinstance(node_positions[target], tuple):
-                        target_positions.append(node_positions[target][1])
-                    else:
-                        target_positions.append(node_positions[target])
+        # Layered placement stores every node as (node_id, x, y); a group
+        # without elements carries its links under its own name
+        target_positions = [
+            node_positions[target][1]
+            for elem in self._group_elements[group] if elem in outgoing
+            for target in outgoing[elem] if target in node_positions
+        ]
         
         if target_positions:
-            target_positions.sort()
-            median_idx = len(target_positions) // 2
-            return target_positions[median_idx]
+            return self._select_kth(target_positions, len(target_positions) // 2)
         
         return 0.0  # Default to left
+    
+    @classmethod
+    def _select_kth(cls, values, k):
+        """
+        Return the k-th smallest value (0-based) without fully sorting.
+        
+        Short lists are sorted directly; longer ones use an iterative
+        three-way quickselect, which is O(n) expected.
+        
+        Args:
+            values: Non-empty list of comparable values
+            k: Index into the sorted order
+            
+        Returns:
+            The value that sorted(values)[k] would give
+        """
+        if len(values) < cls.SELECT_SORT_THRESHOLD:
+            return sorted(values)[k]
+        
+        while True:
+            pivot = values[len(values) // 2]
+            lower = [v for v in values if v < pivot]
+            if k < len(lower):
+                values = lower
+                continue
+            equal_count = sum(1 for v in values if v == pivot)
+            if k < len(lower) + equal_count:
+                return pivot
+            k -= len(lower) + equal_count
+            values = [v for v in values if v > pivot]
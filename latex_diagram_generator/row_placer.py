@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 """Row placement with overflow and splitting logic."""
 
-from typing import Dict, List, Tuple
+import logging
+from collections import Counter
+from typing import AbstractSet, Collection, Dict, List, Optional, Tuple
 from .group_positioner import GroupPositioner
 from .dependency_analyzer import DependencyAnalyzer
 
 # Import spacing constants
 from .spacing_constants import WITHIN_GROUP_SPACING, BETWEEN_GROUP_SPACING
 
+_log = logging.getLogger(__name__)
+
 
 class RowPlacer:
     """Handles row placement with overflow/splitting logic."""
@@ -51,10 +55,11 @@ class RowPlacer:
         # Calculate starting x position
         current_x = self.positioner.calculate_starting_x(group_names, group_widths, center)
         
+        place_group_at_position = self.positioner.place_group_at_position
         if force_sequential:
             # Place all groups on this row sequentially (no wrapping - already pre-split)
             for group_name, width in zip(group_names, group_widths):
-                current_x = self.positioner.place_group_at_position(
+                current_x = place_group_at_position(
                     group_name, width, current_x, y_level, levels, positions, node_positions
                 )
         else:
@@ -69,9 +74,9 @@ class RowPlacer:
                     row_offset_count += 1
                     current_row_y = y_level + (row_offset_count * 0.1)
                     current_x = 0.0
-                    print(f"  Wrapping {group_name} to y={current_row_y:.1f} (would exceed x=40)")
+                    _log.debug("  Wrapping %s to y=%.1f (would exceed x=40)", group_name, current_row_y)
                 
-                current_x = self.positioner.place_group_at_position(
+                current_x = place_group_at_position(
                     group_name, width, current_x, current_row_y, levels, positions, node_positions
                 )
     
@@ -80,19 +85,30 @@ class RowPlacer:
         if not group_names:
             return 0.0
         
-        total = 0.0
-        for i, group_name in enumerate(group_names):
-            group = self.group_name_to_group[group_name]
-            if 'elements' in group:
-                num_elements = len(group['elements'])
-                width = (num_elements - 1) * self.WITHIN_GROUP_SPACING if num_elements > 1 else 0
-            else:
-                width = 0
-            total += width
-            if i < len(group_names) - 1:
-                total += self.positioner.BETWEEN_GROUP_SPACING  # Inter-group spacing
+        # Group widths plus one inter-group spacing between each adjacent pair
+        total = sum(map(self.positioner.get_group_width, group_names))
+        return total + self.positioner.BETWEEN_GROUP_SPACING * (len(group_names) - 1)
+    
+    def row_fits(self, group_names: List[str], max_width: float) -> bool:
+        """
+        Check whether a row fits within max_width, stopping at the first group
+        that pushes the running width past it.
         
-        return total
+        Args:
+            group_names: Groups on the row
+            max_width: Maximum allowed row width
+            
+        Returns:
+            True if calculate_row_width(group_names) <= max_width
+        """
+        get_width = self.positioner.get_group_width
+        spacing = self.positioner.BETWEEN_GROUP_SPACING
+        total = -spacing
+        for group_name in group_names:
+            total += get_width(group_name) + spacing
+            if total > max_width:
+                return False
+        return True
     
     def would_exceed_max_x(self, current_x: float, group_width: float) -> bool:
         """Check if placing a group would exceed MAX_X_POSITION."""
@@ -112,12 +128,12 @@ class RowPlacer:
         """
         groups_with_incoming = []
         groups_without_incoming = []
+        add_with = groups_with_incoming.append
+        add_without = groups_without_incoming.append
+        has_incoming = self._group_has_incoming
         
         for group_name in group_names:
-            if self._group_has_incoming(group_name, incoming):
-                groups_with_incoming.append(group_name)
-            else:
-                groups_without_incoming.append(group_name)
+            (add_with if has_incoming(group_name, incoming) else add_without)(group_name)
         
         return groups_with_incoming, groups_without_incoming
     
@@ -132,37 +148,39 @@ class RowPlacer:
         Returns:
             True if group has incoming links
         """
-        group = self.group_name_to_group[group_name]
-        
-        if 'elements' in group:
-            for elem in group['elements']:
-                if elem in incoming:
-                    return True
-        elif group_name in incoming:
-            return True
-        
-        return False
+        # A group without elements is its own single element
+        return not incoming.keys().isdisjoint(self.positioner.get_group_elements(group_name))
     
-    def select_groups_by_priority(self, row_groups: List[str], groups_with_incoming: List[str],
-                                   groups_without_incoming: List[str]) -> List[str]:
+    def select_groups_by_priority(self, row_groups: List[str], groups_with_incoming: Collection[str],
+                                   groups_without_incoming: Collection[str]) -> List[str]:
         """
         Select groups to move based on priority (prefer groups with incoming links).
         
         Args:
             row_groups: Groups currently on the row
-            groups_with_incoming: Groups that have incoming links (priority)
+            groups_with_incoming: Groups that have incoming links (priority);
+                pass a set when calling repeatedly
             groups_without_incoming: Groups without incoming links
             
         Returns:
             List of groups to consider for moving
         """
-        groups_to_move = [g for g in row_groups if g in groups_with_incoming]
+        # Set membership keeps this linear; it runs again on every split pass
+        with_incoming = self._as_set(groups_with_incoming)
+        groups_to_move = [g for g in row_groups if g in with_incoming]
         if not groups_to_move:
-            groups_to_move = [g for g in row_groups if g in groups_without_incoming]
+            without_incoming = self._as_set(groups_without_incoming)
+            groups_to_move = [g for g in row_groups if g in without_incoming]
         return groups_to_move
     
+    @staticmethod
+    def _as_set(groups: Collection[str]) -> AbstractSet[str]:
+        """Return groups as a set, reusing it when it already is one."""
+        return groups if isinstance(groups, (set, frozenset)) else set(groups)
+    
     def sort_groups_by_distance_from_center(self, groups_to_move: List[str], 
-                                             outgoing: Dict, node_positions: Dict) -> List[str]:
+                                             outgoing: Dict, node_positions: Dict,
+                                             target_x_map: Optional[Dict[str, float]] = None) -> List[str]:
         """
         Sort groups by their distance from center (x=6.0).
         
@@ -170,39 +188,57 @@ class RowPlacer:
             groups_to_move: Groups to sort
             outgoing: Dictionary of outgoing links
             node_positions: Current node positions
+            target_x_map: Optional precomputed target x-positions by group
             
         Returns:
             List of groups sorted by distance from center
         """
         center_x = 6.0
-        groups_with_target_x = []
-        for g in groups_to_move:
-            target_x = self._get_group_target_x(g, outgoing, node_positions)
-            groups_with_target_x.append((g, abs(target_x - center_x)))
-        
-        # Sort by distance from center
-        groups_with_target_x.sort(key=lambda x: x[1])
-        return [g for g, _ in groups_with_target_x]
+        if target_x_map is None:
+            target_x_map = {}
+        
+        def distance_from_center(g):
+            target_x = target_x_map.get(g)
+            if target_x is None:
+                target_x = self._get_group_target_x(g, outgoing, node_positions)
+            return abs(target_x - center_x)
+        
+        # sorted() computes each key once and is stable for equal distances
+        return sorted(groups_to_move, key=distance_from_center)
     
-    def _get_group_target_x(self, group_name, outgoing, node_positions):
-        """Get the target x-position for a group based on where it points."""
-        group = self.group_name_to_group[group_name]
+    def _get_group_target_x(self, group_name, outgoing, node_positions, target_cache=None):
+        """
+        Get the target x-position for a group based on where it points.
         
-        if 'elements' in group:
-            first_elem = group['elements'][0]
-            if first_elem in outgoing:
-                target_list = outgoing[first_elem]
-                target = target_list[0] if isinstance(target_list, list) else target_list
-                if target in node_positions:
-                    return node_positions[target]
-        elif group_name in outgoing:
-            target_list = outgoing[group_name]
-            target = target_list[0] if isinstance(target_list, list) else target_list
-            if target in node_positions:
-                return node_positions[target]
+        The target a group points at depends only on outgoing, so callers
+        placing several rows against the same links may pass a target_cache
+        dict; positions are still read live from node_positions.
+        """
+        if target_cache is None:
+            target = self._get_group_target(group_name, outgoing)
+        elif group_name in target_cache:
+            target = target_cache[group_name]
+        else:
+            target = target_cache[group_name] = self._get_group_target(group_name, outgoing)
+        
+        if target is not None and target in node_positions:
+            return node_positions[target]
         
         return 6.0  # Default center
     
+    def _get_group_target(self, group_name, outgoing):
+        """Get the first target of a group's first element, or None."""
+        group = self.group_name_to_group[group_name]
+        
+        if 'elements' in group:
+            source = group['elements'][0]
+        else:
+            source = group_name
+        if source not in outgoing:
+            return None
+        target_list = outgoing[source]
+        return target_list[0] if isinstance(target_list, list) else target_list
+    
     def move_groups_until_fit(self, sorted_groups: List[str], row_groups: List[str],
                               max_width: float) -> Tuple[List[str], List[str]]:
         """
@@ -219,18 +255,32 @@ class RowPlacer:
         move_to_next = []
         keep_on_row = []
         
+        # Track the remaining row's width as groups move instead of
+        # rebuilding and re-measuring the kept list for every candidate
+        get_width = self.positioner.get_group_width
+        spacing = self.positioner.BETWEEN_GROUP_SPACING
+        occurrences = Counter(row_groups)
+        moved = set()
+        remaining_count = len(row_groups)
+        remaining_widths = sum(map(get_width, row_groups))
+        
         for g in sorted_groups:
             move_to_next.append(g)
-            test_keep = [x for x in row_groups if x not in move_to_next]
-            if self.calculate_row_width(test_keep) <= max_width:
-                keep_on_row = test_keep
+            if g not in moved and g in occurrences:
+                moved.add(g)
+                remaining_count -= occurrences[g]
+                remaining_widths -= get_width(g) * occurrences[g]
+            row_width = remaining_widths + spacing * (remaining_count - 1) if remaining_count else 0.0
+            if row_width <= max_width:
+                keep_on_row = [x for x in row_groups if x not in moved]
                 break
         
         return keep_on_row, move_to_next
     
     def split_overcrowded_row(self, row_groups: List[str], groups_with_incoming: List[str],
                                groups_without_incoming: List[str], outgoing: Dict,
-                               node_positions: Dict, max_width: float) -> Tuple[List[str], List[str]]:
+                               node_positions: Dict, max_width: float,
+                               target_x_map: Optional[Dict[str, float]] = None) -> Tuple[List[str], List[str]]:
         """
         Split an overcrowded row into keep and move groups.
         
@@ -241,6 +291,7 @@ class RowPlacer:
             outgoing: Dictionary of outgoing links
             node_positions: Current node positions
             max_width: Maximum allowed row width
+            target_x_map: Optional precomputed target x-positions by group
             
         Returns:
             Tuple of (keep_on_row, move_to_next)
@@ -253,7 +304,7 @@ class RowPlacer:
         if groups_to_move:
             # Sort by distance from center
             sorted_groups = self.sort_groups_by_distance_from_center(
-                groups_to_move, outgoing, node_positions
+                groups_to_move, outgoing, node_positions, target_x_map
             )
             
             # Move groups until remaining fit
@@ -275,7 +326,8 @@ class RowPlacer:
         return keep_on_row, move_to_next
     
     def split_rows_until_fit(self, rows, groups_with_incoming, groups_without_incoming,
-                             outgoing, node_positions, max_row_width, start_y):
+                             outgoing, node_positions, max_row_width, start_y,
+                             target_x_map=None):
         """
         Split rows until all fit within maximum width.
         
@@ -286,41 +338,43 @@ class RowPlacer:
             node_positions: Current node positions
             max_row_width: Maximum allowed row width
             start_y: Starting y-level
+            target_x_map: Optional precomputed target x-positions by group
             
         Returns:
             List of rows that fit within width constraints
         """
-        while True:
-            all_fit = True
+        # Rows before a split are left untouched by it, so each pass resumes
+        # at the row that was just split instead of rescanning from the top
+        row_idx = 0
+        while row_idx < len(rows):
+            row_groups = rows[row_idx]
+            if not row_groups:
+                row_idx += 1
+                continue
             
-            for row_idx, row_groups in enumerate(rows):
-                if not row_groups:
-                    continue
-                
-                total_width = self.calculate_row_width(row_groups)
-                
-                if total_width > max_row_width:
-                    all_fit = False
-                    print(f"  Row {start_y + row_idx} too wide ({total_width:.1f} > {max_row_width}), splitting...")
-                    
-                    keep_on_row, move_to_next = self.split_overcrowded_row(
-                        row_groups, groups_with_incoming, groups_without_incoming,
-                        outgoing, node_positions, max_row_width
-                    )
-                    
-                    rows[row_idx] = keep_on_row
-                    if row_idx + 1 < len(rows):
-                        rows[row_idx + 1] = move_to_next + rows[row_idx + 1]
-                    else:
-                        rows.append(move_to_next)
-                    break
+            if self.row_fits(row_groups, max_row_width):
+                row_idx += 1
+                continue
             
-            if all_fit:
-                break
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("  Row %s too wide (%.1f > %s), splitting...",
+                           start_y + row_idx, self.calculate_row_width(row_groups), max_row_width)
+            
+            keep_on_row, move_to_next = self.split_overcrowded_row(
+                row_groups, groups_with_incoming, groups_without_incoming,
+                outgoing, node_positions, max_row_width, target_x_map
+            )
+            
+            rows[row_idx] = keep_on_row
+            if row_idx + 1 < len(rows):
+                rows[row_idx + 1] = move_to_next + rows[row_idx + 1]
+            else:
+                rows.append(move_to_next)
         
         return rows
     
-    def place_split_rows(self, rows, start_y, levels, positions, node_positions, outgoing):
+    def place_split_rows(self, rows, start_y, levels, positions, node_positions, outgoing,
+                         target_cache=None):
         """
         Place groups on their assigned rows.
         
@@ -329,14 +383,15 @@ class RowPlacer:
             start_y: Starting y-level
             levels, positions, node_positions: Dicts to update
             outgoing: Dictionary of outgoing links
+            target_cache: Optional dict memoizing each group's target element
         """
         for row_idx, row_groups in enumerate(rows):
             if row_groups:
                 y = start_y + row_idx
                 self.place_groups_on_row_centered_by_target(
-                    row_groups, y, levels, positions, node_positions, outgoing
+                    row_groups, y, levels, positions, node_positions, outgoing, target_cache
                 )
-                print(f"  Placed {len(row_groups)} groups on row {y}: {row_groups}")
+                _log.debug("  Placed %d groups on row %s: %s", len(row_groups), y, row_groups)
     
     def place_groups_on_row_with_overflow(self, group_names, start_y, levels, positions, 
                                            node_positions, incoming, outgoing, placed_groups):
@@ -371,7 +426,7 @@ class RowPlacer:
             
             # Place first batch
             self.place_groups_on_row(first_batch, start_y, levels, positions, node_positions)
-            print(f"  Placed {len(first_batch)} groups on row {start_y}: {first_batch}")
+            _log.debug("  Placed %d groups on row %s: %s", len(first_batch), start_y, first_batch)
             placed_groups.update(first_batch)
             
             # Recursively place second batch on next row
@@ -380,28 +435,50 @@ class RowPlacer:
                 node_positions, incoming, outgoing, placed_groups
             )
         
+        # Common case: everything fits on one row, no splitting needed
+        if self.row_fits(group_names, MAX_ROW_WIDTH):
+            self.place_split_rows([group_names], start_y, levels, positions, node_positions, outgoing, {})
+            return True
+        
         # Classify groups by incoming links
         groups_with_incoming, groups_without_incoming = self.classify_groups_by_incoming(
             group_names, incoming
         )
+        # Every split pass tests membership in these; hash them once here
+        groups_with_incoming = frozenset(groups_with_incoming)
+        groups_without_incoming = frozenset(groups_without_incoming)
+        
+        # Nothing is placed while splitting, so each target x is looked up once;
+        # the targets themselves are reused when the rows are placed
+        target_cache = {}
+        target_x_map = {
+            g: self._get_group_target_x(g, outgoing, node_positions, target_cache) for g in group_names
+        }
         
         # Try to fit all groups, splitting rows as needed
         rows = [group_names]
         rows = self.split_rows_until_fit(
             rows, groups_with_incoming, groups_without_incoming,
-            outgoing, node_positions, MAX_ROW_WIDTH, start_y
+            outgoing, node_positions, MAX_ROW_WIDTH, start_y, target_x_map
         )
         
         # Place groups on their assigned rows
-        self.place_split_rows(rows, start_y, levels, positions, node_positions, outgoing)
+        self.place_split_rows(rows, start_y, levels, positions, node_positions, outgoing, target_cache)
         
         return True
     
     def place_groups_on_row_centered_by_target(self, group_names, y_level, levels, 
-                                                 positions, node_positions, outgoing):
+                                                 positions, node_positions, outgoing,
+                                                 target_cache=None):
         """Place groups on a row, each centered above its target."""
+        # Spans already on this row, kept sorted as groups are added
+        row_intervals = self.positioner.collect_row_intervals(
+            y_level, levels, positions, exclude=set(group_names)
+        )
+        get_group_target_x = self._get_group_target_x
+        place_single_group_centered = self.positioner.place_single_group_centered
         for group_name in group_names:
-            target_x = self._get_group_target_x(group_name, outgoing, node_positions)
-            self.positioner.place_single_group_centered(
-                group_name, y_level, target_x, levels, positions, node_positions
+            target_x = get_group_target_x(group_name, outgoing, node_positions, target_cache)
+            place_single_group_centered(
+                group_name, y_level, target_x, levels, positions, node_positions, row_intervals
             )
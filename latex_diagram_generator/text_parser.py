@@ -2,8 +2,42 @@
 Parser for ultra-compact text format diagram specifications.
 """
 
-import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# Separator symbols that sit between elements but are not elements themselves
+_SEPARATORS = frozenset(('+', '-', '|'))
+
+
+def _parse_at_position(text: str) -> Optional[Tuple[float, float]]:
+    """
+    Parse an optional 'at (x, y)' position from group modifiers.
+    
+    Matches the same text as the pattern at\\s*\\(([^,]+),\\s*([^)]+)\\) using
+    find/slice scans: the first 'at' followed by optional whitespace, '(',
+    a non-empty x up to the first comma and a non-empty y up to the next ')'.
+    
+    Args:
+        text: Modifier text following the group's elements
+        
+    Returns:
+        (x, y) tuple, or None if there is no position or it is not numeric
+    """
+    start = text.find('at')
+    while start != -1:
+        paren = start + 2
+        while paren < len(text) and text[paren].isspace():
+            paren += 1
+        if paren < len(text) and text[paren] == '(':
+            comma = text.find(',', paren + 1)
+            if comma > paren + 1:
+                close = text.find(')', comma + 1)
+                if close > comma + 1:
+                    try:
+                        return float(text[paren + 1:comma]), float(text[comma + 1:close])
+                    except ValueError:
+                        return None
+        start = text.find('at', start + 1)
+    return None
 
 
 class TextFormatParser:
@@ -19,47 +53,16 @@ class TextFormatParser:
         self.text = text
         self.groups = []
         self.links = {}
-    
-    def _is_section_header(self, line: str) -> str:
-        """
-        Check if line is a section header or comment.
-        
-        Args:
-            line: Line to check
-            
-        Returns:
-            'groups', 'links', 'comment', or None
-        """
-        if line.startswith('#'):
-            lower_line = line.lower()
-            if 'group' in lower_line:
-                return 'groups'
-            elif 'link' in lower_line:
-                return 'links'
-            else:
-                return 'comment'  # Any other # line is a comment
-        return None
-    
-    def _classify_single_line(self, line: str, current_section: str) -> Tuple[str, str]:
-        """
-        Classify a single line as group or link.
-        
-        Args:
-            line: Line to classify
-            current_section: Current section context
-            
-        Returns:
-            Tuple of (line_type, updated_section) where line_type is 'group' or 'link'
-        """
-        if '->' in line:
-            return 'link', 'links' if current_section is None else current_section
-        else:
-            return 'group', 'groups' if current_section is None else current_section
+        self._elements_index = None  # element tuple -> group name, built after groups parse
     
     def _classify_lines(self, lines: List[str]) -> Tuple[List[str], List[str]]:
         """
         Classify lines into groups and links.
         
+        Lines containing '->' are links and all others are groups. Lines
+        starting with # (section headers such as "# Groups" and comments)
+        are skipped, since the arrow alone decides a line's kind.
+        
         Args:
             lines: List of input lines
             
@@ -68,29 +71,20 @@ class TextFormatParser:
         """
         group_lines = []
         link_lines = []
-        current_section = None
+        add_group = group_lines.append
+        add_link = link_lines.append
         
         for line in lines:
             line = line.strip()
             
-            # Skip empty lines
-            if not line:
+            # Skip empty lines, headers and comments
+            if not line or line[0] == '#':
                 continue
             
-            # Check for section headers and comments
-            section_type = self._is_section_header(line)
-            if section_type:
-                if section_type in ('groups', 'links'):
-                    current_section = section_type
-                # Skip all lines starting with # (headers and comments)
-                continue
-            
-            # Classify line
-            line_type, current_section = self._classify_single_line(line, current_section)
-            if line_type == 'link':
-                link_lines.append(line)
+            if '->' in line:
+                add_link(line)
             else:
-                group_lines.append(line)
+                add_group(line)
         
         return group_lines, link_lines
     
@@ -106,19 +100,11 @@ class TextFormatParser:
         Returns:
             Group dictionary
         """
-        elements = [elem.strip() for elem in elements_str.split() if elem.strip()]
+        elements = elements_str.split()  # split() already drops whitespace and empties
         group_name = f"group_{counter}"
         has_underline = 'underline' in modifiers.lower()
         # Parse optional at (x, y)
-        pos_match = re.search(r'at\s*\(([^,]+),\s*([^)]+)\)', modifiers)
-        group_position = None
-        if pos_match:
-            try:
-                pos_x = float(pos_match.group(1))
-                pos_y = float(pos_match.group(2))
-                group_position = (pos_x, pos_y)
-            except Exception:
-                group_position = None
+        group_position = _parse_at_position(modifiers)
         
         group = {
             'name': group_name,
@@ -146,16 +132,10 @@ class TextFormatParser:
         element_name = parts[0]
         has_underline = len(parts) > 1 and 'underline' in parts[1].lower()
         # Parse optional at (x, y)
+        # The line is stripped, so the modifiers follow the element name directly
         group_position = None
         if len(parts) > 1:
-            pos_match = re.search(r'at\s*\(([^,]+),\s*([^)]+)\)', ' '.join(parts[1:]))
-            if pos_match:
-                try:
-                    pos_x = float(pos_match.group(1))
-                    pos_y = float(pos_match.group(2))
-                    group_position = (pos_x, pos_y)
-                except Exception:
-                    group_position = None
+            group_position = _parse_at_position(line[len(element_name):])
         group = {'name': element_name}
         if has_underline:
             group['underline'] = True
@@ -173,7 +153,7 @@ class TextFormatParser:
         Raises:
             ValueError: If an element appears in multiple groups
         """
-        lines = self.text.strip().split('\n')
+        lines = self.text.splitlines()  # lines are stripped one by one in _classify_lines
         
         # Classify lines into groups and links
         group_lines, link_lines = self._classify_lines(lines)
@@ -188,7 +168,8 @@ class TextFormatParser:
         # Validate plus element positioning
         self._validate_plus_elements()
         
-        # Then parse links
+        # Then parse links, resolving bracketed references through the index
+        self._build_elements_index()
         for line in link_lines:
             self._parse_link_line(line)
         
@@ -217,7 +198,7 @@ class TextFormatParser:
             # Check each element
             for elem in elements:
                 # Skip special symbols - they're separators, not actual elements
-                if elem in ['+', '-', '|']:
+                if elem in _SEPARATORS:
                     continue
                 
                 if elem not in element_to_groups:
@@ -256,51 +237,40 @@ class TextFormatParser:
                 # Single element groups are always valid
                 continue
             
-            # Check if group has any plus elements
-            has_plus = '+' in elements
-            
-            if not has_plus:
-                # No plus elements, validation passes
-                continue
-            
-            # If group has plus, verify plus appears between all non-plus elements
-            non_plus_elements = [elem for elem in elements if elem != '+']
+            # One pass counts both kinds of element and finds the first place
+            # the elem + elem + elem alternation breaks
+            plus_count = 0
+            non_plus_count = 0
+            violation = None
+            for i, elem in enumerate(elements):
+                if elem == '+':
+                    plus_count += 1
+                    # Even positions should be non-plus elements
+                    if violation is None and not i % 2:
+                        violation = "has plus (+) in wrong position"
+                else:
+                    non_plus_count += 1
+                    # Odd positions should be plus elements
+                    if violation is None and i % 2:
+                        violation = "is missing plus (+) between elements"
             
-            if len(non_plus_elements) < 2:
-                # Need at least 2 non-plus elements for this validation to make sense
+            if not plus_count or non_plus_count < 2:
+                # No plus elements, or too few elements for this validation to make sense
                 continue
             
-            # Count plus elements - should be len(non_plus_elements) - 1
-            plus_count = elements.count('+')
-            expected_plus_count = len(non_plus_elements) - 1
+            group_name = group.get('name', f"[{' '.join(elements)}]")
             
+            # Count plus elements - should be non_plus_count - 1
+            expected_plus_count = non_plus_count - 1
             if plus_count != expected_plus_count:
-                group_name = group.get('name', f"[{' '.join(elements)}]")
                 errors.append(
-                    f"  - Group {group_name} has {len(non_plus_elements)} elements but {plus_count} plus symbols "
+                    f"  - Group {group_name} has {non_plus_count} elements but {plus_count} plus symbols "
                     f"(expected {expected_plus_count})"
                 )
-                continue
-            
-            # Verify plus elements are in the correct positions (between elements, not at start/end)
-            # Expected pattern: elem + elem + elem (alternating)
-            for i, elem in enumerate(elements):
-                if i % 2 == 0:
-                    # Even positions should be non-plus elements
-                    if elem == '+':
-                        group_name = group.get('name', f"[{' '.join(elements)}]")
-                        errors.append(
-                            f"  - Group {group_name} has plus (+) in wrong position (should alternate: elem + elem + elem)"
-                        )
-                        break
-                else:
-                    # Odd positions should be plus elements
-                    if elem != '+':
-                        group_name = group.get('name', f"[{' '.join(elements)}]")
-                        errors.append(
-                            f"  - Group {group_name} is missing plus (+) between elements (should alternate: elem + elem + elem)"
-                        )
-                        break
+            elif violation is not None:
+                errors.append(
+                    f"  - Group {group_name} {violation} (should alternate: elem + elem + elem)"
+                )
         
         if errors:
             error_msg = "ERROR: Groups with plus (+) elements must have plus between ALL elements:\n"
@@ -317,11 +287,11 @@ class TextFormatParser:
             counter: Counter for auto-generated group names
         """
         # Check if it's a multi-element group with brackets
-        bracket_match = re.match(r'\[(.*?)\](.*)$', line)
+        close = line.find(']') if line.startswith('[') else -1
         
-        if bracket_match:
-            elements_str = bracket_match.group(1)
-            modifiers = bracket_match.group(2).strip()
+        if close != -1:
+            elements_str = line[1:close]
+            modifiers = line[close + 1:].strip()
             group = self._parse_multi_element_group(elements_str, modifiers, counter)
         else:
             group = self._parse_single_element_group(line)
@@ -335,6 +305,14 @@ class TextFormatParser:
         Args:
             line: Line containing link definitions (may be chained)
         """
+        # Common case: a single 'A -> B' link needs no chain list
+        head, sep, rest = line.partition('->')
+        if not sep:
+            return
+        if '->' not in rest:
+            self.links[self._normalize_element(head)] = self._normalize_element(rest)
+            return
+        
         # Split by '->' to get chain of links
         parts = [part.strip() for part in line.split('->')]
         
@@ -349,26 +327,36 @@ class TextFormatParser:
             # Add link
             self.links[source] = target
     
-    def _parse_bracketed_group_reference(self, bracket_match) -> str:
+    def _parse_bracketed_group_reference(self, elements_str: str) -> str:
         """
         Parse a bracketed group reference and find matching group.
         
         Args:
-            bracket_match: Regex match object for bracketed group
+            elements_str: String inside the brackets
             
         Returns:
             Group name if found, else original bracketed string
         """
-        elements_str = bracket_match.group(1)
-        elements = [elem.strip() for elem in elements_str.split() if elem.strip()]
+        elements = tuple(elements_str.split())
         
-        # Find the group with these elements
-        for group in self.groups:
-            if 'elements' in group and group['elements'] == elements:
-                return group['name']
+        if self._elements_index is None:
+            self._build_elements_index()
         
         # If not found, return original (shouldn't happen if groups properly defined)
-        return f"[{elements_str}]"
+        return self._elements_index.get(elements, f"[{elements_str}]")
+    
+    def _build_elements_index(self):
+        """
+        Index multi-element groups by their element tuple for reference lookup.
+        
+        The first group wins when two groups list the same elements, as the
+        previous linear search did.
+        """
+        index = {}
+        for group in self.groups:
+            if 'elements' in group:
+                index.setdefault(tuple(group['elements']), group['name'])
+        self._elements_index = index
     
     def _normalize_element(self, element: str) -> str:
         """
@@ -383,9 +371,10 @@ class TextFormatParser:
         element = element.strip()
         
         # Check if it's a bracketed group reference
-        bracket_match = re.match(r'\[(.*?)\]', element)
-        if bracket_match:
-            return self._parse_bracketed_group_reference(bracket_match)
+        if element.startswith('['):
+            close = element.find(']')
+            if close != -1:
+                return self._parse_bracketed_group_reference(element[1:close])
         
         return element
 
@@ -7,8 +7,12 @@ managing temporary files, and handling compilation.
 """
 
 import os
+import shutil
 import subprocess
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 from .diagram_generator import DiagramGenerator
@@ -35,6 +39,9 @@ P1 -> P2 -> P3 -> P4
 
 """
     
+    # Number of rendered specifications kept for identical re-submissions
+    RENDER_CACHE_SIZE = 256
+    
     def __init__(self, temp_dir: str = 'temp_diagrams', template_path: str = 'templates/template.tex'):
         """
         Initialize the web service.
@@ -46,6 +53,12 @@ P1 -> P2 -> P3 -> P4
         self.temp_dir = Path(temp_dir)
         self.temp_dir.mkdir(exist_ok=True)
         self.template_path = template_path
+        # Template content, read on first successful use and reused afterwards
+        self._template_text = None
+        # (specification_text, template_path) -> (latex_code, input_with_positions)
+        self._render_cache = OrderedDict()
+        # Requests are served on several threads; every cache access holds this lock
+        self._render_cache_lock = threading.Lock()
         
     def generate_diagram(self, specification_text: str) -> Tuple[bool, Dict]:
         """
@@ -63,30 +76,36 @@ P1 -> P2 -> P3 -> P4
         if not specification_text.strip():
             return False, {'error': 'Empty specification'}
         
-        # Create unique ID for this generation
-        diagram_id = str(uuid.uuid4())
-        output_dir = self.temp_dir / diagram_id
-        output_dir.mkdir(exist_ok=True)
-        
         try:
-            # Parse the text specification
-            try:
-                spec = parse_text_format(specification_text)
-            except Exception as e:
-                return False, {'error': f'Parse error: {str(e)}'}
+            cache_key = (specification_text, self.template_path)
+            cached = self._cached_render(cache_key)
+            if cached is not None:
+                # Identical re-submission: skip parsing and layout
+                latex_code, input_with_positions = cached
+            else:
+                # Parse the text specification
+                try:
+                    spec = parse_text_format(specification_text)
+                except Exception as e:
+                    return False, {'error': f'Parse error: {str(e)}'}
+                
+                # Generate LaTeX
+                generator = DiagramGenerator(spec, template_path=self.template_path,
+                                             template_text=self._load_template_text())
+                latex_code = generator.generate_latex()
+                # Also generate the input with rendered positions
+                try:
+                    input_with_positions = generator.get_input_with_positions()
+                except Exception:
+                    input_with_positions = None
+                self._cache_render(cache_key, latex_code, input_with_positions)
+            
+            # Create unique ID for this generation only once there is LaTeX to build,
+            # so rejected specifications leave no directory behind
+            diagram_id = uuid.uuid4().hex
+            output_dir = self.temp_dir / diagram_id
+            output_dir.mkdir()
             
-            # Generate LaTeX
-            generator = DiagramGenerator(spec, template_path=self.template_path)
-            latex_code = generator.generate_latex()
-            # Also generate the input with rendered positions
-            input_with_positions = None
-            try:
-                temp_input_path = output_dir / 'input_with_positions.txt'
-                generator.export_input_with_positions(str(temp_input_path))
-                with open(temp_input_path, 'r') as f:
-                    input_with_positions = f.read()
-            except Exception:
-                input_with_positions = None
             # Save LaTeX file
             tex_file = output_dir / 'diagram.tex'
             with open(tex_file, 'w') as f:
@@ -118,6 +137,54 @@ P1 -> P2 -> P3 -> P4
         except Exception as e:
             return False, {'error': f'Unexpected error: {str(e)}'}
     
+    def _load_template_text(self) -> Optional[str]:
+        """
+        Read the LaTeX template once and keep it in memory.
+        
+        Returns:
+            Template content, or None if it cannot be read (the generator then
+            reports the missing template itself)
+        """
+        if self._template_text is None:
+            try:
+                with open(self.template_path, 'r') as f:
+                    self._template_text = f.read()
+            except OSError:
+                return None
+        return self._template_text
+    
+    def _cached_render(self, cache_key: Tuple[str, str]) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Look up a rendered specification and mark it as recently used.
+        
+        Args:
+            cache_key: Tuple of (specification_text, template_path)
+            
+        Returns:
+            Tuple of (latex_code, input_with_positions), or None if not cached
+        """
+        with self._render_cache_lock:
+            cached = self._render_cache.get(cache_key)
+            if cached is not None:
+                self._render_cache.move_to_end(cache_key)
+            return cached
+    
+    def _cache_render(self, cache_key: Tuple[str, str], latex_code: str,
+                      input_with_positions: Optional[str]):
+        """
+        Remember a rendered specification, evicting the least recently used one.
+        
+        Args:
+            cache_key: Tuple of (specification_text, template_path)
+            latex_code: Generated LaTeX source
+            input_with_positions: Specification with rendered positions, or None
+        """
+        with self._render_cache_lock:
+            self._render_cache[cache_key] = (latex_code, input_with_positions)
+            self._render_cache.move_to_end(cache_key)
+            if len(self._render_cache) > self.RENDER_CACHE_SIZE:
+                self._render_cache.popitem(last=False)
+    
     def _compile_latex(self, tex_file: Path, output_dir: Path) -> Tuple[bool, Dict]:
         """
         Compile a LaTeX file to PDF using pdflatex.
@@ -132,9 +199,10 @@ P1 -> P2 -> P3 -> P4
         try:
             subprocess.run(
                 ['pdflatex', '-interaction=nonstopmode', '-output-directory', 
-                 str(output_dir), str(tex_file)],
+                 output_dir, tex_file],
                 check=True,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=30
             )
             return True, {}
@@ -161,9 +229,10 @@ P1 -> P2 -> P3 -> P4
         """
         try:
             subprocess.run(
-                ['convert', '-density', '300', str(pdf_file), '-quality', '90', str(png_file)],
+                ['convert', '-density', '300', pdf_file, '-quality', '90', png_file],
                 check=True,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=30
             )
             return True, {}
@@ -224,13 +293,13 @@ P1 -> P2 -> P3 -> P4
         Args:
             max_age_hours: Maximum age in hours before files are deleted
         """
-        import time
         current_time = time.time()
         max_age_seconds = max_age_hours * 3600
         
-        for item in self.temp_dir.iterdir():
-            if item.is_dir():
-                # Check directory modification time
-                if current_time - item.stat().st_mtime > max_age_seconds:
-                    import shutil
-                    shutil.rmtree(item, ignore_errors=True)
+        # scandir entries carry their file type, so only directories are stat'ed
+        with os.scandir(self.temp_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    # Check directory modification time
+                    if current_time - entry.stat().st_mtime > max_age_seconds:
+                        shutil.rmtree(entry.path, ignore_errors=True)
@@ -125,6 +125,18 @@ class TestCheckTextOverlaps(unittest.TestCase):
         
         overlaps = ConflictDetector.check_text_overlaps(positions)
         self.assertEqual(len(overlaps), 0)
+    
+    def test_overlaps_across_bucket_boundaries_in_input_order(self):
+        """Test that nearby labels on either side of a bucket edge are paired in input order."""
+        positions = {
+            'C': (0.63, 2.0),
+            'A': (-0.005, 2.05),
+            'B': (0.6, 1.96),
+            'D': (3.0, 2.0)
+        }
+        
+        overlaps = ConflictDetector.check_text_overlaps(positions)
+        self.assertEqual([(o[0], o[3]) for o in overlaps], [('C', 'A'), ('C', 'B'), ('A', 'B')])
 
 
 class TestCheckArrowCrossings(unittest.TestCase):
@@ -162,6 +174,42 @@ class TestCheckArrowCrossings(unittest.TestCase):
         self.assertEqual(crossings[0][:4], ('A', 'B', 'C', 'D'))
 
 
+class TestCountRowCrossings(unittest.TestCase):
+    """Test count_row_crossings static method."""
+    
+    def test_no_crossings(self):
+        """Test arrows whose source and target orders agree."""
+        arrows = [
+            ('A', 0, 2, 'C', 0, 0),
+            ('B', 2, 2, 'D', 4, 0)
+        ]
+        
+        self.assertEqual(ConflictDetector.count_row_crossings(arrows), 0)
+    
+    def test_shared_endpoints_not_counted(self):
+        """Test that arrows sharing a source or target do not count."""
+        arrows = [
+            ('A', 0, 2, 'C', 4, 0),
+            ('A', 0, 2, 'D', 0, 0),
+            ('B', 2, 2, 'D', 0, 0)
+        ]
+        
+        self.assertEqual(ConflictDetector.count_row_crossings(arrows), 1)
+    
+    def test_matches_check_arrow_crossings(self):
+        """Test that the count agrees with pairwise crossing detection."""
+        arrows = [
+            ('A', 0, 2, 'F', 6, 0),
+            ('B', 2, 2, 'E', 4, 0),
+            ('C', 4, 2, 'D', 0, 0),
+            ('C', 4, 2, 'G', 8, 0)
+        ]
+        
+        expected = len(ConflictDetector.check_arrow_crossings(arrows))
+        self.assertEqual(ConflictDetector.count_row_crossings(arrows), expected)
+        self.assertEqual(expected, 3)
+
+
 class TestCheckArrowThroughText(unittest.TestCase):
     """Test check_arrow_through_text static method."""
     
@@ -63,6 +63,17 @@ class TestCheckArrowIntersections(unittest.TestCase):
         # Should have printed warning
         mock_print.assert_called()
     
+    def test_single_node_has_no_conflicts(self):
+        """Test the single-node fast path for both return modes."""
+        node_positions = {'A': ('node_a', 0, 0)}
+        links = {'A': 'A'}
+        
+        result = self.resolver.check_arrow_intersections(
+            node_positions, links, return_conflicts=True
+        )
+        self.assertEqual(result, ([], [], []))
+        self.assertIsNone(self.resolver.check_arrow_intersections(node_positions, links))
+    
     def test_no_conflicts(self):
         """Test when no conflicts exist."""
         node_positions = {
@@ -159,6 +170,22 @@ class TestFindGroupForElement(unittest.TestCase):
         
         result = self.resolver._find_group_for_element('A', group_name_to_group)
         self.assertEqual(result, 'A')
+    
+    def test_elem_index_matches_scan(self):
+        """Test that the element index gives the same answer as the scan, first group winning."""
+        group_name_to_group = {
+            'G1': {'name': 'G1', 'elements': ['A', '+', 'B']},
+            'B': {'name': 'B'},
+            'G2': {'name': 'G2', 'elements': ['A', 'C']}
+        }
+        
+        elem_index = self.resolver._build_elem_index(group_name_to_group)
+        for element in ['A', 'B', 'C', '+', 'Z']:
+            self.assertEqual(
+                self.resolver._find_group_for_element(element, group_name_to_group, elem_index),
+                self.resolver._find_group_for_element(element, group_name_to_group)
+            )
+        self.assertEqual(elem_index['B'], 'G1')
 
 
 class TestResolveTextOverlaps(unittest.TestCase):
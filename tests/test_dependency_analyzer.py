@@ -5,49 +5,67 @@ import unittest
 from latex_diagram_generator.dependency_analyzer import DependencyAnalyzer
 
 
+# Case tables for the fixture groups: Group1 = [A, B], Group2 = [C], Group3 = [D, E, F]
+
+# (description, outgoing, expected) for has_outgoing_to_other_group('Group1', ...)
+_HAS_OUTGOING_CASES = [
+    ('link to other group', {'A': 'C'}, True),
+    ('no outgoing links', {}, False),
+    ('link within same group', {'A': 'B'}, False),
+    ('list target', {'A': ['C', 'D']}, True),
+]
+
+# (description, all_groups, outgoing, expected sorted bottom groups)
+_FIND_BOTTOM_CASES = [
+    ('one bottom', {'Group1', 'Group2'}, {'A': 'C'}, ['Group2']),
+    ('multiple bottoms', {'Group1', 'Group2', 'Group3'}, {'A': 'D'}, ['Group2', 'Group3']),
+    ('all bottom', {'Group1', 'Group2'}, {}, ['Group1', 'Group2']),
+]
+
+# (description, outgoing, expected) for get_group_target('Group1', ...)
+_GET_TARGET_CASES = [
+    ('element link', {'A': 'C'}, 'Group2'),
+    ('no link', {}, None),
+    ('list target', {'A': ['C', 'D']}, 'Group2'),
+]
+
+# (description, placed_groups, outgoing, expected) for group_links_to_placed('Group1', ...)
+_LINKS_TO_PLACED_CASES = [
+    ('links to placed', {'Group2'}, {'A': 'C'}, True),
+    ('links elsewhere', {'Group3'}, {'A': 'C'}, False),
+    ('no target', {'Group2'}, {}, False),
+]
+
+
 class TestDependencyAnalyzer(unittest.TestCase):
     """Tests for DependencyAnalyzer class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up the group mappings shared by all tests (never mutated)."""
         # Basic test data structures
-        self.group_name_to_group = {
+        cls.group_name_to_group = {
             'Group1': {'elements': ['A', 'B']},
             'Group2': {'elements': ['C']},
             'Group3': {'elements': ['D', 'E', 'F']}
         }
-        self.element_to_group = {
+        cls.element_to_group = {
             'A': 'Group1', 'B': 'Group1',
             'C': 'Group2',
             'D': 'Group3', 'E': 'Group3', 'F': 'Group3'
         }
-        
+    
+    def setUp(self):
+        """Set up test fixtures."""
         self.analyzer = DependencyAnalyzer(self.group_name_to_group, self.element_to_group)
     
     # Tests for has_outgoing_to_other_group
-    def test_has_outgoing_to_other_group_with_outgoing(self):
-        """Test detecting outgoing links to other groups."""
-        outgoing = {'A': 'C'}  # A in Group1 -> C in Group2
-        result = self.analyzer.has_outgoing_to_other_group('Group1', outgoing)
-        self.assertTrue(result)
-    
-    def test_has_outgoing_to_other_group_without_outgoing(self):
-        """Test detecting no outgoing links."""
-        outgoing = {}
-        result = self.analyzer.has_outgoing_to_other_group('Group1', outgoing)
-        self.assertFalse(result)
-    
-    def test_has_outgoing_to_other_group_same_group(self):
-        """Test that links within same group return False."""
-        outgoing = {'A': 'B'}  # Both in Group1
-        result = self.analyzer.has_outgoing_to_other_group('Group1', outgoing)
-        self.assertFalse(result)
-    
-    def test_has_outgoing_to_other_group_list_target(self):
-        """Test with target as list."""
-        outgoing = {'A': ['C', 'D']}
-        result = self.analyzer.has_outgoing_to_other_group('Group1', outgoing)
-        self.assertTrue(result)
+    def test_has_outgoing_to_other_group_table(self):
+        """Test outgoing-link detection for Group1 across link shapes."""
+        for description, outgoing, expected in _HAS_OUTGOING_CASES:
+            with self.subTest(description):
+                result = self.analyzer.has_outgoing_to_other_group('Group1', outgoing)
+                self.assertIs(result, expected)
     
     def test_has_outgoing_to_other_group_from_group_name(self):
         """Test with link from group name directly."""
@@ -63,53 +81,20 @@ class TestDependencyAnalyzer(unittest.TestCase):
         self.assertTrue(result)
     
     # Tests for find_bottom_groups
-    def test_find_bottom_groups_with_one_bottom(self):
-        """Test finding bottom groups when one exists."""
-        all_groups = {'Group1', 'Group2'}
-        outgoing = {'A': 'C'}  # Group1 -> Group2
-        
-        result = self.analyzer.find_bottom_groups(all_groups, outgoing)
-        
-        self.assertEqual(result, ['Group2'])
-    
-    def test_find_bottom_groups_with_multiple(self):
-        """Test finding multiple bottom groups."""
-        all_groups = {'Group1', 'Group2', 'Group3'}
-        outgoing = {'A': 'D'}  # Only Group1 has outgoing
-        
-        result = self.analyzer.find_bottom_groups(all_groups, outgoing)
-        
-        self.assertIn('Group2', result)
-        self.assertIn('Group3', result)
-        self.assertEqual(len(result), 2)
-    
-    def test_find_bottom_groups_all_bottom(self):
-        """Test when all groups are bottom groups."""
-        all_groups = {'Group1', 'Group2'}
-        outgoing = {}
-        
-        result = self.analyzer.find_bottom_groups(all_groups, outgoing)
-        
-        self.assertEqual(len(result), 2)
+    def test_find_bottom_groups_table(self):
+        """Test finding bottom groups with one, several and only bottom groups."""
+        for description, all_groups, outgoing, expected in _FIND_BOTTOM_CASES:
+            with self.subTest(description):
+                result = self.analyzer.find_bottom_groups(all_groups, outgoing)
+                self.assertEqual(sorted(result), expected)
     
     # Tests for get_group_target
-    def test_get_group_target_with_element_link(self):
-        """Test getting target group from element link."""
-        outgoing = {'A': 'C'}
-        result = self.analyzer.get_group_target('Group1', outgoing)
-        self.assertEqual(result, 'Group2')
-    
-    def test_get_group_target_no_link(self):
-        """Test getting None when no target exists."""
-        outgoing = {}
-        result = self.analyzer.get_group_target('Group1', outgoing)
-        self.assertIsNone(result)
-    
-    def test_get_group_target_with_list(self):
-        """Test getting target when outgoing is a list."""
-        outgoing = {'A': ['C', 'D']}
-        result = self.analyzer.get_group_target('Group1', outgoing)
-        self.assertEqual(result, 'Group2')
+    def test_get_group_target_table(self):
+        """Test getting Group1's target group across link shapes."""
+        for description, outgoing, expected in _GET_TARGET_CASES:
+            with self.subTest(description):
+                result = self.analyzer.get_group_target('Group1', outgoing)
+                self.assertEqual(result, expected)
     
     def test_get_group_target_from_group_name(self):
         """Test getting target from group name link."""
@@ -125,32 +110,12 @@ class TestDependencyAnalyzer(unittest.TestCase):
         self.assertEqual(result, 'Group2')
     
     # Tests for group_links_to_placed
-    def test_group_links_to_placed_true(self):
-        """Test when group links to placed group."""
-        placed_groups = {'Group2'}
-        outgoing = {'A': 'C'}
-        
-        result = self.analyzer.group_links_to_placed('Group1', placed_groups, outgoing)
-        
-        self.assertTrue(result)
-    
-    def test_group_links_to_placed_false(self):
-        """Test when group doesn't link to placed groups."""
-        placed_groups = {'Group3'}
-        outgoing = {'A': 'C'}  # Links to Group2, not Group3
-        
-        result = self.analyzer.group_links_to_placed('Group1', placed_groups, outgoing)
-        
-        self.assertFalse(result)
-    
-    def test_group_links_to_placed_no_target(self):
-        """Test when group has no target."""
-        placed_groups = {'Group2'}
-        outgoing = {}
-        
-        result = self.analyzer.group_links_to_placed('Group1', placed_groups, outgoing)
-        
-        self.assertFalse(result)
+    def test_group_links_to_placed_table(self):
+        """Test whether Group1 links into the placed groups."""
+        for description, placed_groups, outgoing, expected in _LINKS_TO_PLACED_CASES:
+            with self.subTest(description):
+                result = self.analyzer.group_links_to_placed('Group1', placed_groups, outgoing)
+                self.assertIs(result, expected)
     
     # Tests for find_next_layer_groups
     def test_find_next_layer_groups_one_group(self):
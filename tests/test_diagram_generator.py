@@ -4,6 +4,7 @@ Tests for the diagram generator.
 """
 
 import unittest
+import copy
 import json
 import os
 from latex_diagram_generator import DiagramGenerator
@@ -12,16 +13,20 @@ from latex_diagram_generator import DiagramGenerator
 class TestDiagramGenerator(unittest.TestCase):
     """Test cases for DiagramGenerator class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Load the example spec once for the whole class."""
+        cls._cached_example_latex = None
+        cls._cached_example_generator = None
+        cls._cached_example_layout = None
         # Load example.json for testing
-        self.example_json_path = 'example.json'
-        if os.path.exists(self.example_json_path):
-            with open(self.example_json_path, 'r') as f:
-                self.example_spec = json.load(f)
+        cls.example_json_path = 'example.json'
+        if os.path.exists(cls.example_json_path):
+            with open(cls.example_json_path, 'r') as f:
+                cls._example_spec = json.load(f)
         else:
             # Fallback example spec if file not found
-            self.example_spec = {
+            cls._example_spec = {
                 "groups": [
                     {"name": "P1"},
                     {"name": "P2"},
@@ -41,9 +46,35 @@ class TestDiagramGenerator(unittest.TestCase):
                 }
             }
     
+    def setUp(self):
+        """Set up test fixtures."""
+        # Generation can annotate group dicts (e.g. y_offsets), so each test gets its own copy
+        self.example_spec = copy.deepcopy(self._example_spec)
+    
+    def _example_latex(self):
+        """Generate LaTeX for the example spec once and share it between tests."""
+        cls = type(self)
+        if cls._cached_example_latex is None:
+            cls._cached_example_latex = DiagramGenerator(copy.deepcopy(cls._example_spec)).generate_latex()
+        return cls._cached_example_latex
+    
+    def _example_generator(self):
+        """Build one generator for the example spec and share it between read-only tests."""
+        cls = type(self)
+        if cls._cached_example_generator is None:
+            cls._cached_example_generator = DiagramGenerator(copy.deepcopy(cls._example_spec))
+        return cls._cached_example_generator
+    
+    def _example_layout(self):
+        """Compute the example layout once and share (levels, positions) between tests."""
+        cls = type(self)
+        if cls._cached_example_layout is None:
+            cls._cached_example_layout = self._example_generator()._compute_layout_bottom_up()
+        return cls._cached_example_layout
+    
     def test_initialization(self):
         """Test DiagramGenerator initialization."""
-        generator = DiagramGenerator(self.example_spec)
+        generator = self._example_generator()
         
         self.assertEqual(len(generator.groups), 5)
         self.assertEqual(len(generator.links), 4)
@@ -55,7 +86,7 @@ class TestDiagramGenerator(unittest.TestCase):
         
     def test_dependency_graph(self):
         """Test dependency graph construction."""
-        generator = DiagramGenerator(self.example_spec)
+        generator = self._example_generator()
         outgoing, incoming = generator._build_dependency_graph()
         
         # Check outgoing links
@@ -68,8 +99,7 @@ class TestDiagramGenerator(unittest.TestCase):
     
     def test_compute_levels(self):
         """Test level computation for vertical positioning."""
-        generator = DiagramGenerator(self.example_spec)
-        levels, positions = generator._compute_layout_bottom_up()
+        levels, positions = self._example_layout()
         
         # P1 should be at a higher level than P2
         self.assertGreater(levels['P1'], levels['P2'])
@@ -82,8 +112,7 @@ class TestDiagramGenerator(unittest.TestCase):
     
     def test_horizontal_positions(self):
         """Test horizontal position computation."""
-        generator = DiagramGenerator(self.example_spec)
-        levels, positions = generator._compute_layout_bottom_up()
+        levels, positions = self._example_layout()
         
         # compount_premise_1 has 3 elements
         start_x, elements = positions['compount_premise_1']
@@ -92,8 +121,7 @@ class TestDiagramGenerator(unittest.TestCase):
     
     def test_latex_generation(self):
         """Test LaTeX code generation."""
-        generator = DiagramGenerator(self.example_spec)
-        latex = generator.generate_latex()
+        latex = self._example_latex()
         
         # Check basic structure
         self.assertIn('\\documentclass{article}', latex)
@@ -166,8 +194,7 @@ class TestDiagramGenerator(unittest.TestCase):
     
     def test_example_file_match(self):
         """Test that generated output matches expected format from example.tex."""
-        generator = DiagramGenerator(self.example_spec)
-        latex = generator.generate_latex()
+        latex = self._example_latex()
         
         # Load expected output if available
         example_tex_path = 'example.tex'
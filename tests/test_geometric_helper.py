@@ -25,6 +25,19 @@ class TestSegmentsIntersect(unittest.TestCase):
         """Test segments on same line."""
         result = GeometricHelper.segments_intersect(0, 0, 2, 0, 3, 0, 5, 0)
         self.assertFalse(result)
+    
+    def test_boundary_cases_table(self):
+        """Test the orientation test's documented behaviour on touching and collinear segments."""
+        cases = [
+            ('shared endpoint', (0, 0, 2, 2, 2, 2, 4, 0), False),
+            ('T-junction on first segment', (0, 0, 4, 0, 2, 0, 2, 3), True),
+            ('perpendicular, stops short', (0, 0, 4, 0, 2, 1, 2, 3), False),
+            ('collinear overlap', (0, 0, 4, 0, 1, 0, 3, 0), False),
+            ('lines cross beyond segments', (0, 0, 1, 1, 3, 0, 0, 3), False),
+        ]
+        for description, coords, expected in cases:
+            with self.subTest(description):
+                self.assertEqual(GeometricHelper.segments_intersect(*coords), expected)
 
 
 class TestLineIntersectsBox(unittest.TestCase):
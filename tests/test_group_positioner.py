@@ -70,6 +70,32 @@ class TestGroupPositioner(unittest.TestCase):
         
         self.assertEqual(result, [0.0])
     
+    def test_get_group_width_cached(self):
+        """Test that group widths are computed once and reused."""
+        self.assertEqual(self.positioner.get_group_width('Group3'), 4.0)
+        
+        self.positioner.group_name_to_group['Group3']['elements'].append('Z')
+        
+        self.assertEqual(self.positioner.get_group_width('Group3'), 4.0)
+    
+    def test_get_group_elements_defaults_to_group_name(self):
+        """Test that a group without elements is its own single element."""
+        positioner = GroupPositioner({'Solo': {}}, 2.0)
+        
+        elements = positioner.get_group_elements('Solo')
+        
+        self.assertEqual(elements, ['Solo'])
+        self.assertIs(positioner.get_group_elements('Solo'), elements)
+    
+    def test_store_node_positions_skips_separators(self):
+        """Test that separator symbols keep their slot but get no node."""
+        positioner = GroupPositioner({'G': {'elements': ['A', '+', 'B']}}, 2.0)
+        node_positions = {}
+        
+        positioner.store_node_positions('G', 1.0, 3, node_positions)
+        
+        self.assertEqual(node_positions, {'A': ('A', 1.0, 3), 'B': ('B', 5.0, 3)})
+    
     # Tests for calculate_starting_x
     def test_calculate_starting_x_centered(self):
         """Test calculating centered starting position."""
@@ -176,6 +202,44 @@ class TestGroupPositioner(unittest.TestCase):
         
         self.assertEqual(result, 3.0)
     
+    def test_adjust_position_for_row_intervals_matches_scan(self):
+        """Test interval-based adjustment agrees with the full scan."""
+        levels = {'Group2': 3, 'Group3': 3, 'Other': 4}
+        positions = {
+            'Group2': (5.0, ['X', 'Y']),   # Spans 5.0-7.0
+            'Group3': (9.5, ['Z']),        # Spans 9.5-9.5
+            'Other': (6.0, ['W'])
+        }
+        
+        intervals = self.positioner.collect_row_intervals(3, levels, positions)
+        
+        self.assertEqual(intervals, [(5.0, 7.0), (9.5, 9.5)])
+        for start_x in (0.0, 2.5, 6.0, 12.0):
+            expected = self.positioner.adjust_position_for_collisions(
+                start_x, 2.0, 3, 'Group1', levels, positions
+            )
+            result = self.positioner.adjust_position_for_row_intervals(start_x, 2.0, intervals)
+            self.assertEqual(result, expected)
+    
+    def test_adjust_position_for_row_intervals_overlapping_spans(self):
+        """Test that an earlier, wider span covering start_x is not skipped."""
+        levels = {'Wide': 3, 'Mid': 3, 'Right': 3}
+        positions = {
+            'Wide': (8.0, ['A', 'B', 'C', 'D']),   # Spans 8.0-14.0
+            'Mid': (9.0, ['E', 'F']),              # Spans 9.0-11.0
+            'Right': (10.0, ['G', 'H'])            # Spans 10.0-12.0
+        }
+        
+        intervals = self.positioner.collect_row_intervals(3, levels, positions)
+        
+        for start_x in (9.0, 9.5, 10.0):
+            expected = self.positioner.adjust_position_for_collisions(
+                start_x, 4.0, 3, 'Group1', levels, positions
+            )
+            result = self.positioner.adjust_position_for_row_intervals(start_x, 4.0, intervals)
+            self.assertEqual(result, expected)
+            self.assertEqual(result, 16.0)
+    
     # Tests for place_single_group_centered
     def test_place_single_group_centered(self):
         """Test placing a single group centered above its target."""
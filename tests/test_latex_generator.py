@@ -7,14 +7,34 @@ import os
 from latex_diagram_generator.latex_generator import LaTeXGenerator
 
 
+# (description, raw, expected) for _sanitize_node_id
+_SANITIZE_CASES = [
+    ('plus', "A+", "aplus"),
+    ('minus', "B-", "bminus"),
+    ('apostrophe', "P'", "pp"),
+    ('dot', "N.1", "n_1"),
+    ('space', "Node Name", "node_name"),
+    ('lowercase conversion', "ABC", "abc"),
+    ('multiple special characters', "A+ B-C'.D", "aplus_bminuscp_d"),
+]
+
+# (description, template, x_spacing, font_size, expected, replaced) for _apply_template
+_APPLY_TEMPLATE_CASES = [
+    ('spacing', "x=1.00cm", 0.75, 12, "x=0.75cm", "x=1.00cm"),
+    ('font size', "fontsize{12}{12}", 1.0, 10, "fontsize{10}{10}", "fontsize{12}{12}"),
+]
+
+
 class TestLatexGenerator(unittest.TestCase):
     """Tests for LaTeXGenerator class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create a temporary template file
-        self.temp_template = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.tex')
-        self.temp_template.write("""\\documentclass{article}
+    @classmethod
+    def setUpClass(cls):
+        """Write the template once and share one generator across the class."""
+        # LaTeXGenerator keeps no state beyond its constructor arguments, so
+        # every test can use the same instance
+        temp_template = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.tex')
+        temp_template.write("""\\documentclass{article}
 \\begin{document}
 \\begin{tikzpicture}[x=1.00cm, y=1cm, fontsize{12}{12}]
 [[nodes]]
@@ -23,14 +43,15 @@ class TestLatexGenerator(unittest.TestCase):
 \\end{tikzpicture}
 \\end{document}
 """)
-        self.temp_template.close()
-        self.template_path = self.temp_template.name
-        self.gen = LaTeXGenerator(self.template_path, within_group_spacing=2.0)
+        temp_template.close()
+        cls.template_path = temp_template.name
+        cls.gen = LaTeXGenerator(cls.template_path, within_group_spacing=2.0)
     
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.template_path):
-            os.unlink(self.template_path)
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the shared template file."""
+        if os.path.exists(cls.template_path):
+            os.unlink(cls.template_path)
     
     # Tests for __init__
     def test_init_sets_template_path(self):
@@ -38,6 +59,11 @@ class TestLatexGenerator(unittest.TestCase):
         gen = LaTeXGenerator("/path/to/template.tex")
         self.assertEqual(gen.template_path, "/path/to/template.tex")
     
+    def test_load_template_prefers_template_text(self):
+        """Test that preloaded template text is used without reading the path."""
+        gen = LaTeXGenerator("/path/to/missing.tex", template_text="[[nodes]]")
+        self.assertEqual(gen._load_template(), "[[nodes]]")
+    
     def test_init_sets_default_spacing(self):
         """Test that init sets default within group spacing."""
         gen = LaTeXGenerator("/path/to/template.tex")
@@ -116,33 +142,11 @@ class TestLatexGenerator(unittest.TestCase):
             self.assertEqual(font_size, 12)
     
     # Tests for _sanitize_node_id
-    def test_sanitize_node_id_with_plus(self):
-        """Test sanitization of node IDs with plus signs."""
-        self.assertEqual(self.gen._sanitize_node_id("A+"), "aplus")
-    
-    def test_sanitize_node_id_with_minus(self):
-        """Test sanitization of node IDs with minus signs."""
-        self.assertEqual(self.gen._sanitize_node_id("B-"), "bminus")
-    
-    def test_sanitize_node_id_with_apostrophe(self):
-        """Test sanitization of node IDs with apostrophes."""
-        self.assertEqual(self.gen._sanitize_node_id("P'"), "pp")
-    
-    def test_sanitize_node_id_with_dot(self):
-        """Test sanitization of node IDs with dots."""
-        self.assertEqual(self.gen._sanitize_node_id("N.1"), "n_1")
-    
-    def test_sanitize_node_id_with_space(self):
-        """Test sanitization of node IDs with spaces."""
-        self.assertEqual(self.gen._sanitize_node_id("Node Name"), "node_name")
-    
-    def test_sanitize_node_id_lowercase_conversion(self):
-        """Test that node IDs are converted to lowercase."""
-        self.assertEqual(self.gen._sanitize_node_id("ABC"), "abc")
-    
-    def test_sanitize_node_id_complex(self):
-        """Test sanitization with multiple special characters."""
-        self.assertEqual(self.gen._sanitize_node_id("A+ B-C'.D"), "aplus_bminuscp_d")
+    def test_sanitize_node_id_table(self):
+        """Test node ID sanitization across the special-character cases."""
+        for description, raw, expected in _SANITIZE_CASES:
+            with self.subTest(description):
+                self.assertEqual(self.gen._sanitize_node_id(raw), expected)
     
     # Tests for _create_node_for_element
     def test_create_node_for_element_basic(self):
@@ -478,23 +482,14 @@ class TestLatexGenerator(unittest.TestCase):
         self.assertNotIn("[[links]]", result)
         self.assertNotIn("[[underlines]]", result)
     
-    def test_apply_template_spacing_replacement(self):
-        """Test that x-spacing is properly replaced."""
-        template = "x=1.00cm"
-        
-        result = self.gen._apply_template(template, [], [], [], 0.75, 12)
-        
-        self.assertIn("x=0.75cm", result)
-        self.assertNotIn("x=1.00cm", result)
-    
-    def test_apply_template_font_size_replacement(self):
-        """Test that font size is properly replaced."""
-        template = "fontsize{12}{12}"
-        
-        result = self.gen._apply_template(template, [], [], [], 1.0, 10)
-        
-        self.assertIn("fontsize{10}{10}", result)
-        self.assertNotIn("fontsize{12}{12}", result)
+    def test_apply_template_replacement_table(self):
+        """Test that x-spacing and font size placeholders are properly replaced."""
+        for description, template, x_spacing, font_size, expected, replaced in _APPLY_TEMPLATE_CASES:
+            with self.subTest(description):
+                result = self.gen._apply_template(template, [], [], [], x_spacing, font_size)
+                
+                self.assertIn(expected, result)
+                self.assertNotIn(replaced, result)
     
     # Tests for _load_template
     def test_load_template_success(self):
@@ -2,7 +2,10 @@
 """Unit tests for Layout Engine."""
 
 import unittest
+from unittest.mock import patch
+from latex_diagram_generator.conflict_detector import ConflictDetector
 from latex_diagram_generator.layout_engine import LayoutEngine
+from latex_diagram_generator.row_placer import RowPlacer
 
 
 class TestLayoutEngine(unittest.TestCase):
@@ -187,6 +190,113 @@ class TestLayoutEngine(unittest.TestCase):
         self.assertEqual(len(positions), 1)
         self.assertIn('G1', levels)
 
+    
+    def test_normalize_links_wraps_single_targets(self):
+        """Test that single-target links become one-element lists."""
+        links = {'A': 'B', 'C': ['D', 'E']}
+        
+        self.assertEqual(LayoutEngine._normalize_links(links), {'A': ['B'], 'C': ['D', 'E']})
+        self.assertEqual(links['A'], 'B')
+    
+    def test_build_group_sources(self):
+        """Test group adjacency covers element and group-level links."""
+        self.engine._initialize_layout(self.group_name_to_group, self.element_to_group)
+        outgoing = {'A': ['C'], 'Group1': ['D'], 'C': ['C']}
+        
+        has_outgoing, group_sources = self.engine._build_group_sources(
+            list(self.group_name_to_group), outgoing
+        )
+        
+        self.assertIn('Group1', has_outgoing)
+        self.assertIn('Group2', has_outgoing)
+        self.assertEqual(group_sources['Group2'], ['Group1', 'Group2'])
+        self.assertEqual(group_sources['Group3'], ['Group1'])
+        self.assertNotIn('Group3', has_outgoing)
+    
+    # Tests for median selection
+    def test_select_kth_matches_sorted(self):
+        """Test quickselect agrees with sorting for short and long inputs."""
+        for values in ([3.0, 1.0, 2.0], [float((i * 7) % 23) for i in range(40)] + [4.0] * 5):
+            for k in (0, len(values) // 2, len(values) - 1):
+                self.assertEqual(LayoutEngine._select_kth(list(values), k), sorted(values)[k])
+    
+    # Tests for barycenter ordering
+    def test_orderings_by_barycenter_starts_with_barycenter_order(self):
+        """Test that the barycenter order is tried first, then single swaps."""
+        engine = LayoutEngine()
+        barycenters = {'G1': 4.0, 'G2': 0.0, 'G3': 2.0}
+        
+        orderings = list(engine._orderings_by_barycenter(['G1', 'G2', 'G3'], barycenters))
+        
+        self.assertEqual(orderings[0], ('G2', 'G3', 'G1'))
+        self.assertEqual(set(orderings[1:3]), {('G3', 'G2', 'G1'), ('G2', 'G1', 'G3')})
+        # Every ordering is still reachable exactly once
+        self.assertEqual(len(orderings), 6)
+        self.assertEqual(len(set(orderings)), 6)
+    
+    def test_layer_barycenters_uses_placed_neighbours(self):
+        """Test barycenters average placed neighbours and default to inf."""
+        self.engine._initialize_layout(self.group_name_to_group, self.element_to_group)
+        outgoing = {'A': ['X'], 'B': ['Y']}
+        incoming = {'C': ['Z']}
+        node_positions = {'X': ('X', 1.0, 0), 'Y': ('Y', 3.0, 0)}
+        
+        barycenters = self.engine._layer_barycenters(
+            ['Group1', 'Group2'], outgoing, incoming, node_positions
+        )
+        
+        self.assertEqual(barycenters['Group1'], 2.0)
+        self.assertEqual(barycenters['Group2'], float('inf'))
+
+    
+    # Tests for cycle handling in the arrow-aware layout
+    def _cyclic_spec(self):
+        """Return a spec where A and B link to each other and B also links to C (listed first)."""
+        group_name_to_group = {'C': {'name': 'C'}, 'A': {'name': 'A'}, 'B': {'name': 'B'}}
+        element_to_group = {'A': 'A', 'B': 'B', 'C': 'C'}
+        outgoing = {'A': ['B'], 'B': ['A', 'C']}
+        incoming = {'A': ['B'], 'B': ['A'], 'C': ['B']}
+        return group_name_to_group, element_to_group, outgoing, incoming
+    
+    def test_pick_cycle_breaker_skips_groups_downstream_of_cycle(self):
+        """Test that the forced group lies on the cycle, not below it."""
+        group_targets = {'A': {'B'}, 'B': {'A', 'C'}, 'C': {'D'}}
+        
+        self.assertEqual(LayoutEngine._pick_cycle_breaker(['C', 'D', 'A', 'B'], set(), group_targets), 'A')
+        self.assertEqual(LayoutEngine._pick_cycle_breaker(['C', 'D', 'B', 'A'], set(), group_targets), 'B')
+    
+    def test_arrow_aware_layout_handles_cycle(self):
+        """Test that a cyclic spec lays out, with the group below the cycle placed under it."""
+        group_name_to_group, element_to_group, outgoing, incoming = self._cyclic_spec()
+        
+        levels, positions = self.engine.compute_layout_bottom_up_arrow_aware(
+            group_name_to_group, element_to_group, outgoing, incoming, ConflictDetector()
+        )
+        
+        self.assertEqual(set(positions), {'A', 'B', 'C'})
+        self.assertLess(levels['A'], levels['B'])
+        self.assertLess(levels['B'], levels['C'])
+    
+    def test_arrow_aware_layout_rejects_upward_arrow_outside_cycle(self):
+        """Test that only links closing the cycle are exempt from the downward-arrow check."""
+        group_name_to_group, element_to_group, outgoing, incoming = self._cyclic_spec()
+        place_groups_on_row = RowPlacer.place_groups_on_row
+        
+        def place_then_lift_c(placer, row, y_level, levels, positions, node_positions, **kwargs):
+            place_groups_on_row(placer, row, y_level, levels, positions, node_positions, **kwargs)
+            if 'C' in node_positions:
+                elem, x, _ = node_positions['C']
+                node_positions['C'] = (elem, x, -1.0)
+        
+        with patch.object(RowPlacer, 'place_groups_on_row', place_then_lift_c):
+            with self.assertRaises(RuntimeError) as cm:
+                self.engine.compute_layout_bottom_up_arrow_aware(
+                    group_name_to_group, element_to_group, outgoing, incoming, ConflictDetector()
+                )
+        
+        self.assertIn('Arrow from B', str(cm.exception))
+        self.assertIn('to C', str(cm.exception))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -111,6 +111,15 @@ class TestRowPlacer(unittest.TestCase):
         # Total: 2.0 + 0.0 + 4.0 + 4.0 = 10.0
         self.assertEqual(result, 10.0)
     
+    def test_row_fits_matches_row_width(self):
+        """Test row_fits agrees with calculate_row_width at the boundary."""
+        row = ['Group1', 'Group2', 'Group3']
+        width = self.row_placer.calculate_row_width(row)
+        
+        self.assertTrue(self.row_placer.row_fits(row, width))
+        self.assertFalse(self.row_placer.row_fits(row, width - 0.5))
+        self.assertTrue(self.row_placer.row_fits([], 0.0))
+    
     # Tests for _get_group_target_x
     def test_get_group_target_x_with_position(self):
         """Test getting target x position."""
@@ -139,6 +148,20 @@ class TestRowPlacer(unittest.TestCase):
         
         self.assertEqual(result, 6.0)
     
+    def test_get_group_target_x_cache_reads_live_positions(self):
+        """Test that a target cache memoizes targets but not positions."""
+        outgoing = {'A': 'X'}
+        node_positions = {}
+        target_cache = {}
+        
+        first = self.row_placer._get_group_target_x('Group1', outgoing, node_positions, target_cache)
+        node_positions['X'] = 3.0
+        second = self.row_placer._get_group_target_x('Group1', outgoing, node_positions, target_cache)
+        
+        self.assertEqual(first, 6.0)
+        self.assertEqual(second, 3.0)
+        self.assertEqual(target_cache, {'Group1': 'X'})
+    
     # Tests for select_groups_by_priority
     def test_select_groups_by_priority_with_incoming(self):
         """Test selecting groups with priority for those with incoming."""
@@ -194,6 +217,20 @@ class TestRowPlacer(unittest.TestCase):
         self.assertIn('Group1', result)
         self.assertIn('Group2', result)
     
+    def test_sort_groups_by_distance_from_center_uses_target_x_map(self):
+        """Test that precomputed target positions replace link lookups."""
+        groups_to_move = ['Group1', 'Group2']
+        outgoing = {'A': 'X', 'C': 'Y'}
+        node_positions = {'X': 6.0, 'Y': 7.0}
+        target_x_map = {'Group1': 12.0}
+        
+        result = self.row_placer.sort_groups_by_distance_from_center(
+            groups_to_move, outgoing, node_positions, target_x_map
+        )
+        
+        # Group1 is 6.0 from center via the map, Group2 falls back to 1.0
+        self.assertEqual(result, ['Group2', 'Group1'])
+    
     # Tests for move_groups_until_fit
     def test_move_groups_until_fit(self):
         """Test moving groups until row fits."""
@@ -218,6 +255,25 @@ class TestRowPlacer(unittest.TestCase):
         # Should move groups until width fits
         self.assertGreater(len(move), 0)
     
+    def test_move_groups_until_fit_ignores_groups_off_row(self):
+        """Test that candidates not on the row do not reduce its width."""
+        group_name_to_group = {
+            'G1': {'elements': ['A', 'B']},
+            'G2': {'elements': ['C', 'D']},
+            'G3': {'elements': ['E']},
+            'G4': {'elements': ['F', 'G', 'H']},
+        }
+        positioner = GroupPositioner(group_name_to_group, 2.0, 3.0)
+        row_placer = RowPlacer(group_name_to_group, {}, positioner, None)
+        
+        # Row width: 2 + 3 + 2 + 3 + 0 = 10
+        keep, move = row_placer.move_groups_until_fit(
+            ['G4', 'G2', 'G1'], ['G1', 'G2', 'G3'], 5.0
+        )
+        
+        self.assertEqual(move, ['G4', 'G2'])
+        self.assertEqual(keep, ['G1', 'G3'])
+    
     # Tests for split_overcrowded_row
     def test_split_overcrowded_row_fallback(self):
         """Test fallback splitting when no prioritized groups."""
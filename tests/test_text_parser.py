@@ -26,6 +26,7 @@ class TestTextFormatParser(unittest.TestCase):
                     content = f.read()
             os.remove(output_path)
             self.assertIn('at (', content)
+            self.assertEqual(generator.get_input_with_positions(), content)
 
     def test_group_with_position_override(self):
         """Test parsing group with at (x, y) position override."""
@@ -42,6 +43,18 @@ class TestTextFormatParser(unittest.TestCase):
         self.assertEqual(group1['override_position'], (5.0, 11.0))
         self.assertIn('override_position', group2)
         self.assertEqual(group2['override_position'], (2.5, 7.0))
+
+    def test_group_position_with_underline_and_bad_values(self):
+        """Test at (x, y) parsing next to underline and with non-numeric values."""
+        text = """
+        [A B] underline at(1,  -2)
+        C at (x, 3)
+        """
+        spec = parse_text_format(text)
+        group1, group2 = spec['groups']
+        self.assertTrue(group1['underline'])
+        self.assertEqual(group1['override_position'], (1.0, -2.0))
+        self.assertNotIn('override_position', group2)
     """Test cases for text format parser."""
     
     def test_simple_groups(self):
@@ -472,6 +485,16 @@ B
         self.assertIn('A', group_names)
         self.assertIn('B', group_names)
 
+    
+    def test_unknown_bracketed_reference_kept(self):
+        """Test that a bracketed reference matching no group is kept as written."""
+        text = """
+[A B]
+[A B] -> [C D]
+"""
+        spec = parse_text_format(text)
+        
+        self.assertEqual(spec['links'], {'group_0': '[C D]'})
 
 if __name__ == '__main__':
     unittest.main()
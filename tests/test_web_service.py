@@ -6,6 +6,7 @@ Unit tests for the DiagramWebService class
 import unittest
 import tempfile
 import shutil
+import threading
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from latex_diagram_generator.web_service import DiagramWebService
@@ -52,6 +53,13 @@ class TestDiagramWebService(unittest.TestCase):
         self.assertFalse(success)
         self.assertIn('error', result)
     
+    def test_parse_error_creates_no_output_directory(self):
+        """Test that a rejected specification leaves the temp directory empty."""
+        success, result = self.service.generate_diagram('[A + B C]')
+        self.assertFalse(success)
+        self.assertIn('Parse error', result['error'])
+        self.assertEqual(list(Path(self.test_temp_dir).iterdir()), [])
+    
     @patch.object(DiagramWebService, '_convert_pdf_to_png')
     @patch.object(DiagramWebService, '_compile_latex')
     def test_valid_specification_structure(self, mock_compile, mock_convert):
@@ -79,6 +87,56 @@ P1 -> P2
         self.assertTrue(mock_compile.called)
         self.assertTrue(mock_convert.called)
     
+    @patch.object(DiagramWebService, '_convert_pdf_to_png')
+    @patch.object(DiagramWebService, '_compile_latex')
+    def test_repeated_specification_uses_render_cache(self, mock_compile, mock_convert):
+        """Test that an identical re-submission skips parsing and reuses the LaTeX."""
+        mock_compile.return_value = (True, {})
+        mock_convert.return_value = (True, {})
+        
+        spec = """P1
+P2
+P1 -> P2
+"""
+        success, first = self.service.generate_diagram(spec)
+        self.assertTrue(success)
+        
+        with patch('latex_diagram_generator.web_service.parse_text_format') as mock_parse:
+            success, second = self.service.generate_diagram(spec)
+        
+        self.assertTrue(success)
+        mock_parse.assert_not_called()
+        self.assertEqual(second['latex'], first['latex'])
+        self.assertEqual(second['input_with_positions'], first['input_with_positions'])
+        self.assertNotEqual(second['diagram_id'], first['diagram_id'])
+    
+    @patch.object(DiagramWebService, '_convert_pdf_to_png')
+    @patch.object(DiagramWebService, '_compile_latex')
+    def test_render_cache_concurrent_access(self, mock_compile, mock_convert):
+        """Test that concurrent requests sharing and evicting cache entries all succeed."""
+        mock_compile.return_value = (True, {})
+        mock_convert.return_value = (True, {})
+        # A tiny cache makes lookups race with evictions
+        self.service.RENDER_CACHE_SIZE = 2
+        specs = [f"P{i}\nQ{i}\nP{i} -> Q{i}\n" for i in range(4)]
+        failures = []
+        
+        def submit_all(offset):
+            for round_index in range(10):
+                spec = specs[(offset + round_index) % len(specs)]
+                success, result = self.service.generate_diagram(spec)
+                if not success:
+                    failures.append(result)
+        
+        threads = [threading.Thread(target=submit_all, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(failures, [])
+        self.assertLessEqual(len(self.service._render_cache), 2)
+    
     def test_get_file_path_valid_types(self):
         """Test getting file paths for valid file types."""
         diagram_id = 'test-id'
@@ -132,6 +190,25 @@ P1 -> P2
             self.service.cleanup_old_files(max_age_hours=0)
         except Exception as e:
             self.fail(f"Cleanup raised an exception: {e}")
+    
+    def test_cleanup_removes_only_old_directories(self):
+        """Test that cleanup deletes stale diagram directories and keeps the rest."""
+        import os
+        import time
+        temp_dir = Path(self.test_temp_dir)
+        old_dir = temp_dir / 'old'
+        new_dir = temp_dir / 'new'
+        old_dir.mkdir()
+        new_dir.mkdir()
+        (temp_dir / 'stray.txt').write_text('x')
+        two_days_ago = time.time() - 48 * 3600
+        os.utime(old_dir, (two_days_ago, two_days_ago))
+        
+        self.service.cleanup_old_files(max_age_hours=24)
+        
+        self.assertFalse(old_dir.exists())
+        self.assertTrue(new_dir.exists())
+        self.assertTrue((temp_dir / 'stray.txt').exists())
 
 
 class TestDiagramWebServiceIntegration(unittest.TestCase):